@@ -3,17 +3,28 @@
 CDK app entry point for Quip-S3 synchronization system
 """
 
+import os
+
 import aws_cdk as cdk
 from infrastructure.quip_sync_stack import QuipSyncStack
+from infrastructure.validation import validate_stack_name
 
 
 app = cdk.App()
 
 # Get parameters from CDK context or environment
-custom_name = app.node.try_get_context("customName")
-quicksight_principal_id = app.node.try_get_context("quicksightPrincipalId")
-quicksight_namespace = app.node.try_get_context("quicksightNamespace") or "default"
-service_role_arn = app.node.try_get_context("serviceRoleArn")
+ctx = app.node.try_get_context
+custom_name = ctx("customName")
+quicksight_principal_id = ctx("quicksightPrincipalId")
+quicksight_namespace = ctx("quicksightNamespace") or "default"
+service_role_arn = ctx("serviceRoleArn")
+enable_quicksight_policy = str(ctx("enableQuickSightPolicy")).lower() != "false"
+vpc_id = ctx("vpcId")
+create_s3_endpoint = str(ctx("createS3Endpoint")).lower() != "false"
+lambda_code_version = ctx("lambdaCodeVersion")
+lambda_memory_mb = int(ctx("lambdaMemoryMB") or 1769)
+quip_max_workers = int(ctx("quipMaxWorkers") or 8)
+enable_alarm_notifications = str(ctx("enableAlarmNotifications")).lower() == "true"
 
 # Use a default custom_name for template synthesis if not provided
 # This allows 'cdk synth' to work without parameters for generating the template
@@ -30,48 +41,6 @@ if not custom_name:
 # Create stack name in format QuipSyncStack-<custom-name>
 stack_name = f"QuipSyncStack-{custom_name}"
 
-# Validate stack name follows CloudFormation naming conventions
-def validate_stack_name(name: str) -> str:
-    """
-    Validate CloudFormation stack name follows AWS naming conventions
-    
-    Args:
-        name: The stack name to validate
-        
-    Returns:
-        str: The validated stack name
-        
-    Raises:
-        ValueError: If stack name doesn't meet CloudFormation requirements
-    """
-    import re
-    
-    # CloudFormation stack naming rules:
-    # - 1-128 characters
-    # - Letters, numbers, and hyphens only
-    # - Must start with letter
-    # - Cannot end with hyphen
-    
-    if not name:
-        raise ValueError("Stack name cannot be empty")
-    
-    if len(name) < 1 or len(name) > 128:
-        raise ValueError("Stack name must be between 1 and 128 characters long")
-    
-    # Check for valid characters (letters, numbers, hyphens only)
-    if not re.match(r'^[a-zA-Z0-9-]+$', name):
-        raise ValueError("Stack name can only contain letters, numbers, and hyphens")
-    
-    # Must start with letter (this will always pass since we use QuipSyncStack- prefix)
-    if not re.match(r'^[a-zA-Z]', name):
-        raise ValueError("Stack name must start with a letter")
-    
-    # Cannot end with hyphen
-    if name.endswith('-'):
-        raise ValueError("Stack name cannot end with a hyphen")
-    
-    return name
-
 # Validate the generated stack name
 stack_name = validate_stack_name(stack_name)
 
@@ -82,6 +51,18 @@ QuipSyncStack(
     quicksight_principal_id=quicksight_principal_id,
     quicksight_namespace=quicksight_namespace,
     service_role_arn=service_role_arn,
+    enable_quicksight_policy=enable_quicksight_policy,
+    vpc_id=vpc_id,
+    create_s3_endpoint=create_s3_endpoint,
+    lambda_code_version=lambda_code_version,
+    lambda_memory_mb=lambda_memory_mb,
+    quip_max_workers=quip_max_workers,
+    enable_alarm_notifications=enable_alarm_notifications,
+    # VPC lookups need a concrete environment; otherwise keep the template environment-agnostic
+    env=cdk.Environment(
+        account=os.environ.get("CDK_DEFAULT_ACCOUNT"),
+        region=os.environ.get("CDK_DEFAULT_REGION")
+    ) if vpc_id else None,
     description=f"Quip-to-S3 document synchronization system ({custom_name})"
 )
 
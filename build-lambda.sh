@@ -10,6 +10,10 @@ if [ -f "venv/bin/activate" ]; then
     source venv/bin/activate
 fi
 
+# Target platform for binary wheels; must match the Lambda function's architecture
+LAMBDA_PLATFORM="${LAMBDA_PLATFORM:-manylinux2014_aarch64}"
+LAMBDA_PYTHON_VERSION="3.13"
+
 echo "Building Lambda code package..."
 
 # Create a temporary directory for the build
@@ -21,9 +25,18 @@ mkdir -p "$BUILD_DIR"
 echo "Copying Lambda source code..."
 cp -r src/* "$BUILD_DIR/"
 
-# Install dependencies
+# Install dependencies as prebuilt wheels for the Lambda platform, without bytecode
+# (Lambda compiles on import and .pyc files only bloat the package)
 echo "Installing Python dependencies..."
-pip install -r src/requirements.txt -t "$BUILD_DIR"
+PIP_DISABLE_PIP_VERSION_CHECK=1 pip install \
+    --no-cache-dir \
+    --no-compile \
+    --only-binary=:all: \
+    --platform "$LAMBDA_PLATFORM" \
+    --implementation cp \
+    --python-version "$LAMBDA_PYTHON_VERSION" \
+    --target "$BUILD_DIR" \
+    -r src/requirements.txt
 
 # Remove unnecessary files
 echo "Cleaning up unnecessary files..."
@@ -32,6 +45,10 @@ find "$BUILD_DIR" -type f -name "*.pyc" -delete
 find "$BUILD_DIR" -type f -name "*.pyo" -delete
 find "$BUILD_DIR" -type d -name "*.dist-info" -exec rm -rf {} + 2>/dev/null || true
 find "$BUILD_DIR" -type d -name "*.egg-info" -exec rm -rf {} + 2>/dev/null || true
+find "$BUILD_DIR" -mindepth 2 -type d -name "tests" -exec rm -rf {} + 2>/dev/null || true
+
+# The Lambda Python runtime already ships the AWS SDK
+rm -rf "$BUILD_DIR/boto3" "$BUILD_DIR/botocore" "$BUILD_DIR/s3transfer" "$BUILD_DIR/bin"
 
 # Create the zip file
 echo "Creating zip file..."
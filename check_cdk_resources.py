@@ -7,334 +7,549 @@ a fresh CDK bootstrap from deploying. It looks for orphaned or partially deleted
 resources from previous bootstrap attempts.
 """
 
-import boto3
+import argparse
+import io
 import json
+import os
+import re
+import shlex
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+import boto3
 from botocore.exceptions import ClientError
 
 
+def compile_patterns(patterns):
+    """Compile a list of substrings into a single case-insensitive matcher"""
+    return re.compile('|'.join(map(re.escape, patterns)), re.IGNORECASE)
+
+
+# Static name patterns; account/region-specific ones are compiled per check
+CDK_IAM_ROLE_RE = compile_patterns([
+    "cdk-hnb659fds-",
+    "cdk-",
+    "CDKToolkit",
+    "CloudFormationExecutionRole",
+    "DeploymentActionRole",
+    "FilePublishingRole",
+    "ImagePublishingRole",
+    "LookupRole",
+])
+CDK_SSM_PARAM_RE = compile_patterns(["/cdk-bootstrap/", "/cdk/"])
+CDK_STACK_RE = compile_patterns(["CDKToolkit", "cdk-"])
+# Any alias containing "cdktoolkit" also contains "cdk"
+CDK_KMS_ALIAS_RE = compile_patterns(["cdk"])
+
+# Every stack status except DELETE_COMPLETE
+ACTIVE_STACK_STATUSES = [
+    'CREATE_IN_PROGRESS', 'CREATE_FAILED', 'CREATE_COMPLETE',
+    'ROLLBACK_IN_PROGRESS', 'ROLLBACK_FAILED', 'ROLLBACK_COMPLETE',
+    'DELETE_IN_PROGRESS', 'DELETE_FAILED',
+    'UPDATE_IN_PROGRESS', 'UPDATE_COMPLETE_CLEANUP_IN_PROGRESS',
+    'UPDATE_COMPLETE', 'UPDATE_FAILED', 'UPDATE_ROLLBACK_IN_PROGRESS',
+    'UPDATE_ROLLBACK_FAILED', 'UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS',
+    'UPDATE_ROLLBACK_COMPLETE', 'REVIEW_IN_PROGRESS',
+    'IMPORT_IN_PROGRESS', 'IMPORT_COMPLETE', 'IMPORT_ROLLBACK_IN_PROGRESS',
+    'IMPORT_ROLLBACK_FAILED', 'IMPORT_ROLLBACK_COMPLETE',
+]
+
+# Failed stacks are red, in-progress yellow, everything else green
+STACK_STATUS_EMOJI = {
+    status: "🔴" if "FAILED" in status else "🟡" if "IN_PROGRESS" in status else "🟢"
+    for status in ACTIVE_STACK_STATUSES
+}
+
+
+# Results are reused across runs for a short while, since the checker tends
+# to be re-run repeatedly while debugging a failed bootstrap. They live in a
+# per-user directory because the cached names end up in the cleanup script.
+CACHE_DIR = Path.home() / ".cache" / "quip-s3-sync"
+CACHE_TTL_SECONDS = 60
+
+# Parameter values are shown live but never written to the cache
+SSM_VALUE_LINE_RE = re.compile(r'^(\s*└── Value: ).*$', re.MULTILINE)
+
+# Where generated cleanup commands are written, one new file per run
+CLEANUP_SCRIPT_NAME = "cleanup-{timestamp}.sh"
+
+# Single session shared by every check so credentials are resolved once
+SESSION = boto3.session.Session()
+
+
+@lru_cache(maxsize=1)
 def get_account_id():
     """Get the current AWS account ID"""
-    sts = boto3.client('sts')
-    return sts.get_caller_identity()['Account']
+    return SESSION.client('sts').get_caller_identity()['Account']
 
 
+@lru_cache(maxsize=1)
 def get_region():
     """Get the current AWS region"""
-    session = boto3.session.Session()
-    return session.region_name or 'us-east-1'
+    return SESSION.region_name or 'us-east-1'
+
+
+def get_bucket_status(s3, bucket_name):
+    """Describe whether a bucket is empty"""
+    try:
+        objects = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1)
+        if objects.get('KeyCount', 0) > 0:
+            return "Bucket contains objects"
+        return "Bucket is empty"
+    except ClientError as e:
+        return f"Cannot access bucket: {e}"
+
+
+class CheckReport(io.StringIO):
+    """Buffered output of one check, remembering whether the check hit an error"""
+    
+    def __init__(self):
+        super().__init__()
+        self.failed = False
+
+
+def is_private(path):
+    """Check that a path is owned by the current user and not accessible to anyone else"""
+    st = path.stat()
+    return st.st_uid == os.getuid() and not st.st_mode & 0o077
+
+
+def get_cache_path(account_id, region):
+    """Get the cache file for an account and region, or None if the cache directory is not private"""
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # The directory may predate this check (or have been created by deploy.py) with a looser mode
+        if CACHE_DIR.stat().st_uid == os.getuid():
+            CACHE_DIR.chmod(0o700)
+        if not is_private(CACHE_DIR):
+            return None
+    except OSError:
+        return None
+    return CACHE_DIR / f"cdk-resource-check-{account_id}-{region}.json"
+
+
+def load_cached_results(path):
+    """Load cached check results if they are still fresh and were written by this user"""
+    try:
+        if not is_private(path) or time.time() - path.stat().st_mtime >= CACHE_TTL_SECONDS:
+            return None
+        with path.open() as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_results(path, results, reports):
+    """Cache check results without parameter values, ignoring failures to write the cache file"""
+    reports = [SSM_VALUE_LINE_RE.sub(r'\1(not cached)', report) for report in reports]
+    tmp_path = path.with_name(path.name + '.tmp')
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'results': results, 'reports': reports}, f, default=str)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def find_tagged_resources(rgt):
+    """Find S3, ECR and SSM resources tagged as part of the CDKToolkit stack"""
+    tagged = {}
+    
+    paginator = rgt.get_paginator('get_resources')
+    for page in paginator.paginate(
+        TagFilters=[{'Key': 'aws:cloudformation:stack-name', 'Values': ['CDKToolkit']}],
+        PaginationConfig={'PageSize': 100}
+    ):
+        for mapping in page['ResourceTagMappingList']:
+            # arn:partition:service:region:account:resource
+            _, _, service, _, _, resource = mapping['ResourceARN'].split(':', 5)
+            if service == 's3':
+                tagged.setdefault('s3', []).append(resource)
+            elif service == 'ecr' and resource.startswith('repository/'):
+                tagged.setdefault('ecr', []).append(resource.split('/', 1)[1])
+            elif service == 'ssm' and resource.startswith('parameter/'):
+                tagged.setdefault('ssm', []).append(resource[len('parameter'):])
+    
+    return tagged
+
+
+def add_tagged_names(found, tagged_names):
+    """Append tagged names the name patterns missed, returning the ones added"""
+    seen = set(found)
+    extra = [name for name in tagged_names if name not in seen]
+    found.extend(extra)
+    return extra
 
 
-def check_s3_buckets(account_id, region):
-    """Check for CDK staging buckets"""
-    print("\n📦 Checking S3 Buckets...")
-    s3 = boto3.client('s3')
+def check_s3_buckets(s3, account_id, region, out, tagged_names=()):
+    """Check for CDK staging buckets, including any tagged as part of CDKToolkit"""
+    print("\n📦 Checking S3 Buckets...", file=out)
     
     # CDK bootstrap bucket naming patterns
-    patterns = [
+    bucket_re = compile_patterns([
         f"cdk-hnb659fds-assets-{account_id}-{region}",
-        f"cdktoolkit-stagingbucket-",
+        "cdktoolkit-stagingbucket-",
         f"cdk-{account_id}-assets-{region}",
-    ]
+    ])
     
     found_buckets = []
     
     try:
-        response = s3.list_buckets()
-        for bucket in response['Buckets']:
-            bucket_name = bucket['Name']
-            for pattern in patterns:
-                if pattern in bucket_name or bucket_name.startswith(pattern):
-                    found_buckets.append(bucket_name)
-                    print(f"  ⚠️  Found CDK bucket: {bucket_name}")
-                    
-                    # Check if bucket is empty
-                    try:
-                        objects = s3.list_objects_v2(Bucket=bucket_name, MaxKeys=1)
-                        if objects.get('KeyCount', 0) > 0:
-                            print(f"      └── Bucket contains objects")
-                        else:
-                            print(f"      └── Bucket is empty")
-                    except ClientError as e:
-                        print(f"      └── Cannot access bucket: {e}")
-                    break
+        # ListBuckets pagination needs a recent botocore; fall back to one call
+        if s3.can_paginate('list_buckets'):
+            paginator = s3.get_paginator('list_buckets')
+            bucket_names = paginator.paginate(
+                PaginationConfig={'PageSize': 10000}
+            ).search("Buckets[].Name")
+        else:
+            bucket_names = (bucket['Name'] for bucket in s3.list_buckets()['Buckets'])
+        
+        found_buckets = [name for name in bucket_names if bucket_re.search(name)]
     except ClientError as e:
-        print(f"  ❌ Error listing buckets: {e}")
+        print(f"  ❌ Error listing buckets: {e}", file=out)
+        out.failed = True
     
-    if not found_buckets:
-        print("  ✅ No CDK S3 buckets found")
+    add_tagged_names(found_buckets, tagged_names)
+    
+    # Probe all matched buckets for contents concurrently
+    if found_buckets:
+        with ThreadPoolExecutor(max_workers=min(16, len(found_buckets))) as executor:
+            statuses = executor.map(lambda name: get_bucket_status(s3, name), found_buckets)
+            for bucket_name, status in zip(found_buckets, statuses):
+                print(f"  ⚠️  Found CDK bucket: {bucket_name}", file=out)
+                print(f"      └── {status}", file=out)
+    else:
+        print("  ✅ No CDK S3 buckets found", file=out)
     
     return found_buckets
 
 
-def check_ecr_repositories(account_id, region):
-    """Check for CDK ECR repositories"""
-    print("\n🐳 Checking ECR Repositories...")
-    ecr = boto3.client('ecr')
+def check_ecr_repositories(ecr, account_id, region, out, tagged_names=()):
+    """Check for CDK ECR repositories, including any tagged as part of CDKToolkit"""
+    print("\n🐳 Checking ECR Repositories...", file=out)
     
-    patterns = [
+    repo_re = compile_patterns([
         f"cdk-hnb659fds-container-assets-{account_id}-{region}",
         "cdk-",
         "cdktoolkit",
-    ]
+    ])
     
     found_repos = []
     
     try:
         paginator = ecr.get_paginator('describe_repositories')
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': 1000}):
             for repo in page['repositories']:
                 repo_name = repo['repositoryName']
-                for pattern in patterns:
-                    if pattern in repo_name.lower():
-                        found_repos.append(repo_name)
-                        print(f"  ⚠️  Found CDK ECR repo: {repo_name}")
-                        print(f"      └── URI: {repo['repositoryUri']}")
-                        break
+                if repo_re.search(repo_name):
+                    found_repos.append(repo_name)
+                    print(f"  ⚠️  Found CDK ECR repo: {repo_name}", file=out)
+                    print(f"      └── URI: {repo['repositoryUri']}", file=out)
     except ClientError as e:
-        print(f"  ❌ Error listing ECR repos: {e}")
+        print(f"  ❌ Error listing ECR repos: {e}", file=out)
+        out.failed = True
+    
+    for repo_name in add_tagged_names(found_repos, tagged_names):
+        print(f"  ⚠️  Found CDK ECR repo: {repo_name} (tagged by CDKToolkit)", file=out)
     
     if not found_repos:
-        print("  ✅ No CDK ECR repositories found")
+        print("  ✅ No CDK ECR repositories found", file=out)
     
     return found_repos
 
 
-def check_iam_roles():
+def check_iam_roles(iam, out):
     """Check for CDK IAM roles"""
-    print("\n👤 Checking IAM Roles...")
-    iam = boto3.client('iam')
-    
-    cdk_role_patterns = [
-        "cdk-hnb659fds-",
-        "cdk-",
-        "CDKToolkit",
-        "CloudFormationExecutionRole",
-        "DeploymentActionRole",
-        "FilePublishingRole",
-        "ImagePublishingRole",
-        "LookupRole",
-    ]
+    print("\n👤 Checking IAM Roles...", file=out)
     
     found_roles = []
     
     try:
         paginator = iam.get_paginator('list_roles')
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': 1000}):
             for role in page['Roles']:
                 role_name = role['RoleName']
-                for pattern in cdk_role_patterns:
-                    if pattern.lower() in role_name.lower():
-                        found_roles.append(role_name)
-                        print(f"  ⚠️  Found CDK role: {role_name}")
-                        print(f"      └── ARN: {role['Arn']}")
-                        break
+                if CDK_IAM_ROLE_RE.search(role_name):
+                    found_roles.append(role_name)
+                    print(f"  ⚠️  Found CDK role: {role_name}", file=out)
+                    print(f"      └── ARN: {role['Arn']}", file=out)
     except ClientError as e:
-        print(f"  ❌ Error listing IAM roles: {e}")
+        print(f"  ❌ Error listing IAM roles: {e}", file=out)
+        out.failed = True
     
     if not found_roles:
-        print("  ✅ No CDK IAM roles found")
+        print("  ✅ No CDK IAM roles found", file=out)
     
     return found_roles
 
 
-def check_ssm_parameters(region):
-    """Check for CDK SSM parameters"""
-    print("\n📝 Checking SSM Parameters...")
-    ssm = boto3.client('ssm')
-    
-    cdk_param_patterns = [
-        "/cdk-bootstrap/",
-        "/cdk/",
-    ]
+def check_ssm_parameters(ssm, out, tagged_names=()):
+    """Check for CDK SSM parameters, including any tagged as part of CDKToolkit"""
+    print("\n📝 Checking SSM Parameters...", file=out)
     
     found_params = []
     
     try:
         paginator = ssm.get_paginator('describe_parameters')
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': 50}):
             for param in page['Parameters']:
                 param_name = param['Name']
-                for pattern in cdk_param_patterns:
-                    if pattern in param_name:
-                        found_params.append(param_name)
-                        print(f"  ⚠️  Found CDK parameter: {param_name}")
-                        
-                        # Get the value
-                        try:
-                            value_response = ssm.get_parameter(Name=param_name)
-                            print(f"      └── Value: {value_response['Parameter']['Value']}")
-                        except ClientError:
-                            pass
-                        break
+                if CDK_SSM_PARAM_RE.search(param_name):
+                    found_params.append(param_name)
+                    print(f"  ⚠️  Found CDK parameter: {param_name}", file=out)
+                    
+                    # Get the value
+                    try:
+                        value_response = ssm.get_parameter(Name=param_name)
+                        print(f"      └── Value: {value_response['Parameter']['Value']}", file=out)
+                    except ClientError:
+                        pass
     except ClientError as e:
-        print(f"  ❌ Error listing SSM parameters: {e}")
+        print(f"  ❌ Error listing SSM parameters: {e}", file=out)
+        out.failed = True
+    
+    for param_name in add_tagged_names(found_params, tagged_names):
+        print(f"  ⚠️  Found CDK parameter: {param_name} (tagged by CDKToolkit)", file=out)
     
     if not found_params:
-        print("  ✅ No CDK SSM parameters found")
+        print("  ✅ No CDK SSM parameters found", file=out)
     
     return found_params
 
 
-def check_cloudformation_stacks():
+def check_cloudformation_stacks(cfn, out):
     """Check for CDK-related CloudFormation stacks"""
-    print("\n📚 Checking CloudFormation Stacks...")
-    cfn = boto3.client('cloudformation')
-    
-    cdk_stack_patterns = [
-        "CDKToolkit",
-        "cdk-",
-    ]
+    print("\n📚 Checking CloudFormation Stacks...", file=out)
     
     found_stacks = []
     
     try:
-        # Check all stack statuses including deleted
         paginator = cfn.get_paginator('list_stacks')
-        for page in paginator.paginate(StackStatusFilter=[
-            'CREATE_IN_PROGRESS', 'CREATE_FAILED', 'CREATE_COMPLETE',
-            'ROLLBACK_IN_PROGRESS', 'ROLLBACK_FAILED', 'ROLLBACK_COMPLETE',
-            'DELETE_IN_PROGRESS', 'DELETE_FAILED',
-            'UPDATE_IN_PROGRESS', 'UPDATE_COMPLETE_CLEANUP_IN_PROGRESS',
-            'UPDATE_COMPLETE', 'UPDATE_FAILED', 'UPDATE_ROLLBACK_IN_PROGRESS',
-            'UPDATE_ROLLBACK_FAILED', 'UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS',
-            'UPDATE_ROLLBACK_COMPLETE', 'REVIEW_IN_PROGRESS',
-            'IMPORT_IN_PROGRESS', 'IMPORT_COMPLETE', 'IMPORT_ROLLBACK_IN_PROGRESS',
-            'IMPORT_ROLLBACK_FAILED', 'IMPORT_ROLLBACK_COMPLETE'
-        ]):
-            for stack in page['StackSummaries']:
-                stack_name = stack['StackName']
-                for pattern in cdk_stack_patterns:
-                    if pattern.lower() in stack_name.lower():
-                        found_stacks.append({
-                            'name': stack_name,
-                            'status': stack['StackStatus']
-                        })
-                        status_emoji = "🔴" if "FAILED" in stack['StackStatus'] else "🟡" if "IN_PROGRESS" in stack['StackStatus'] else "🟢"
-                        print(f"  {status_emoji} Found CDK stack: {stack_name}")
-                        print(f"      └── Status: {stack['StackStatus']}")
-                        break
+        summaries = paginator.paginate(StackStatusFilter=ACTIVE_STACK_STATUSES).search(
+            "StackSummaries[].{name: StackName, status: StackStatus}"
+        )
+        for stack in summaries:
+            if CDK_STACK_RE.search(stack['name']):
+                found_stacks.append(stack)
+                status_emoji = STACK_STATUS_EMOJI.get(stack['status'], "🟢")
+                print(f"  {status_emoji} Found CDK stack: {stack['name']}", file=out)
+                print(f"      └── Status: {stack['status']}", file=out)
     except ClientError as e:
-        print(f"  ❌ Error listing stacks: {e}")
+        print(f"  ❌ Error listing stacks: {e}", file=out)
+        out.failed = True
     
     if not found_stacks:
-        print("  ✅ No CDK CloudFormation stacks found")
+        print("  ✅ No CDK CloudFormation stacks found", file=out)
     
     return found_stacks
 
 
-def check_kms_keys(account_id, region):
+def check_kms_keys(kms, out):
     """Check for CDK KMS keys"""
-    print("\n🔐 Checking KMS Keys...")
-    kms = boto3.client('kms')
+    print("\n🔐 Checking KMS Keys...", file=out)
     
     found_keys = []
     
     try:
         paginator = kms.get_paginator('list_aliases')
-        for page in paginator.paginate():
+        for page in paginator.paginate(PaginationConfig={'PageSize': 100}):
             for alias in page['Aliases']:
                 alias_name = alias['AliasName']
-                if 'cdk' in alias_name.lower() or 'cdktoolkit' in alias_name.lower():
+                if CDK_KMS_ALIAS_RE.search(alias_name):
                     found_keys.append(alias_name)
-                    print(f"  ⚠️  Found CDK KMS alias: {alias_name}")
+                    print(f"  ⚠️  Found CDK KMS alias: {alias_name}", file=out)
                     if 'TargetKeyId' in alias:
-                        print(f"      └── Key ID: {alias['TargetKeyId']}")
+                        print(f"      └── Key ID: {alias['TargetKeyId']}", file=out)
     except ClientError as e:
-        print(f"  ❌ Error listing KMS keys: {e}")
+        print(f"  ❌ Error listing KMS keys: {e}", file=out)
+        out.failed = True
     
     if not found_keys:
-        print("  ✅ No CDK KMS keys found")
+        print("  ✅ No CDK KMS keys found", file=out)
     
     return found_keys
 
 
-def check_cloudformation_hooks():
+def check_cloudformation_hooks(cfn, out):
     """Check for CloudFormation hooks that might block deployment"""
-    print("\n🪝 Checking CloudFormation Hooks...")
-    cfn = boto3.client('cloudformation')
+    print("\n🪝 Checking CloudFormation Hooks...", file=out)
     
     found_hooks = []
     
     try:
+        paginator = cfn.get_paginator('list_types')
+        
         # List type configurations for hooks
-        response = cfn.list_types(
+        for page in paginator.paginate(
             Visibility='PRIVATE',
-            Type='HOOK'
-        )
-        
-        for type_summary in response.get('TypeSummaries', []):
-            found_hooks.append(type_summary)
-            print(f"  ⚠️  Found Hook: {type_summary['TypeName']}")
-            print(f"      └── ARN: {type_summary.get('TypeArn', 'N/A')}")
+            Type='HOOK',
+            PaginationConfig={'PageSize': 100}
+        ):
+            for type_summary in page.get('TypeSummaries', []):
+                found_hooks.append(type_summary)
+                print(f"  ⚠️  Found Hook: {type_summary['TypeName']}", file=out)
+                print(f"      └── ARN: {type_summary.get('TypeArn', 'N/A')}", file=out)
         
-        # Also check public hooks
-        response = cfn.list_types(
+        # Also check public hooks, letting the registry filter by name
+        for page in paginator.paginate(
             Visibility='PUBLIC',
-            Type='HOOK'
-        )
-        
-        for type_summary in response.get('TypeSummaries', []):
-            if 'EarlyValidation' in type_summary.get('TypeName', ''):
+            Type='HOOK',
+            Filters={'TypeNamePrefix': 'AWS::EarlyValidation'},
+            PaginationConfig={'PageSize': 100}
+        ):
+            for type_summary in page.get('TypeSummaries', []):
                 found_hooks.append(type_summary)
-                print(f"  ⚠️  Found Hook: {type_summary['TypeName']}")
+                print(f"  ⚠️  Found Hook: {type_summary['TypeName']}", file=out)
                 
     except ClientError as e:
-        print(f"  ❌ Error listing hooks: {e}")
+        print(f"  ❌ Error listing hooks: {e}", file=out)
+        out.failed = True
     
     if not found_hooks:
-        print("  ✅ No CloudFormation hooks found (or no permission to list)")
+        print("  ✅ No CloudFormation hooks found (or no permission to list)", file=out)
     
     return found_hooks
 
 
+def run_checks(account_id, region):
+    """Run every resource check, returning their results, printed reports and whether all succeeded"""
+    # Tagged resources are a hint on top of the name-based scans, not a replacement: the
+    # leftovers of a failed bootstrap are often untagged or differently named
+    tagging_ok = True
+    try:
+        tagged = find_tagged_resources(SESSION.client('resourcegroupstaggingapi'))
+    except ClientError:
+        tagged = {}
+        tagging_ok = False
+    if tagged:
+        print(f"🏷️  Including CDKToolkit-tagged resources for: {', '.join(sorted(tagged))}")
+    
+    # Clients are created up front since session.client() is not thread-safe
+    cfn = SESSION.client('cloudformation')
+    checks = [
+        (check_s3_buckets, (SESSION.client('s3'), account_id, region), {'tagged_names': tagged.get('s3', ())}),
+        (check_ecr_repositories, (SESSION.client('ecr'), account_id, region), {'tagged_names': tagged.get('ecr', ())}),
+        (check_iam_roles, (SESSION.client('iam'),), {}),
+        (check_ssm_parameters, (SESSION.client('ssm'),), {'tagged_names': tagged.get('ssm', ())}),
+        (check_cloudformation_stacks, (cfn,), {}),
+        (check_kms_keys, (SESSION.client('kms'),), {}),
+        (check_cloudformation_hooks, (cfn,), {}),
+    ]
+    
+    # Run all checks concurrently, buffering each report so output stays ordered
+    buffers = [CheckReport() for _ in checks]
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [
+            executor.submit(check, *args, out, **kwargs)
+            for (check, args, kwargs), out in zip(checks, buffers)
+        ]
+        results = []
+        for future, out in zip(futures, buffers):
+            results.append(future.result())
+            sys.stdout.write(out.getvalue())
+    
+    complete = tagging_ok and not any(out.failed for out in buffers)
+    return results, [out.getvalue() for out in buffers], complete
+
+
 def generate_cleanup_commands(buckets, repos, roles, params, stacks, keys):
-    """Generate cleanup commands for found resources"""
-    print("\n" + "=" * 60)
-    print("🧹 CLEANUP COMMANDS")
-    print("=" * 60)
-    print("\n⚠️  WARNING: Review these commands carefully before running!")
-    print("    Some resources may be in use by other stacks.\n")
+    """Generate cleanup commands for found resources and save them as a script"""
+    q = shlex.quote
+    script = io.StringIO()
+    print("#!/usr/bin/env bash", file=script)
+    # No -e: every command runs, failures are counted and reported at the end
+    print("set -uo pipefail", file=script)
+    print(file=script)
+    print("failures=0", file=script)
+    print('run() { "$@" || { echo "FAILED: $*" >&2; failures=$((failures + 1)); }; }', file=script)
+    print(file=script)
     
     if stacks:
-        print("# Delete CloudFormation stacks first:")
+        print("# Delete CloudFormation stacks first:", file=script)
         for stack in stacks:
             if stack['status'] != 'DELETE_COMPLETE':
-                print(f"aws cloudformation delete-stack --stack-name {stack['name']}")
-        print()
+                print(f"run aws cloudformation delete-stack --stack-name {q(stack['name'])}", file=script)
+        print(file=script)
     
     if params:
-        print("# Delete SSM parameters:")
+        print("# Delete SSM parameters:", file=script)
         for param in params:
-            print(f"aws ssm delete-parameter --name '{param}'")
-        print()
+            print(f"run aws ssm delete-parameter --name {q(param)}", file=script)
+        print(file=script)
     
     if roles:
-        print("# Delete IAM roles (may need to detach policies first):")
+        print("# Delete IAM roles (may need to detach policies first):", file=script)
         for role in roles:
-            print(f"# aws iam delete-role --role-name {role}")
-        print()
+            print(f"# run aws iam delete-role --role-name {q(role)}", file=script)
+        print(file=script)
     
     if buckets:
-        print("# Empty and delete S3 buckets:")
+        print("# Empty and delete S3 buckets in parallel, then collect each job's exit status:", file=script)
+        print("pids=()", file=script)
         for bucket in buckets:
-            print(f"aws s3 rm s3://{bucket} --recursive")
-            print(f"aws s3 rb s3://{bucket}")
-        print()
+            uri = q(f"s3://{bucket}")
+            print(
+                f"( aws s3 rm {uri} --recursive --only-show-errors --page-size 1000"
+                f" && aws s3 rb {uri} ) &",
+                file=script
+            )
+            print('pids+=("$!")', file=script)
+        print('for pid in "${pids[@]}"; do', file=script)
+        print('    wait "$pid" || { echo "FAILED: bucket deletion job $pid" >&2; failures=$((failures + 1)); }', file=script)
+        print("done", file=script)
+        print(file=script)
     
     if repos:
-        print("# Delete ECR repositories:")
+        print("# Delete ECR repositories:", file=script)
         for repo in repos:
-            print(f"aws ecr delete-repository --repository-name {repo} --force")
-        print()
+            print(f"run aws ecr delete-repository --repository-name {q(repo)} --force", file=script)
+        print(file=script)
     
     if keys:
-        print("# Delete KMS key aliases (keys will be scheduled for deletion):")
+        print("# Delete KMS key aliases (keys will be scheduled for deletion):", file=script)
         for key in keys:
-            print(f"aws kms delete-alias --alias-name {key}")
-        print()
+            print(f"run aws kms delete-alias --alias-name {q(key)}", file=script)
+        print(file=script)
+    
+    print('if [ "$failures" -gt 0 ]; then', file=script)
+    print('    echo "$failures cleanup command(s) failed" >&2', file=script)
+    print("    exit 1", file=script)
+    print("fi", file=script)
+    
+    out = io.StringIO()
+    print("\n" + "=" * 60, file=out)
+    print("🧹 CLEANUP COMMANDS", file=out)
+    print("=" * 60, file=out)
+    print("\n⚠️  WARNING: Review these commands carefully before running!", file=out)
+    print("    Some resources may be in use by other stacks.\n", file=out)
+    out.write(script.getvalue())
+    
+    # Each run gets its own script; an existing file is never overwritten
+    script_path = Path(CLEANUP_SCRIPT_NAME.format(timestamp=time.strftime('%Y%m%d-%H%M%S')))
+    try:
+        with script_path.open('x') as f:
+            f.write(script.getvalue())
+        script_path.chmod(0o755)
+        print(f"📝 Saved to {script_path} - review it, then run: bash {script_path}", file=out)
+    except OSError as e:
+        print(f"❌ Could not write {script_path}: {e}", file=out)
+    
+    sys.stdout.write(out.getvalue())
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Check for CDK bootstrap resources left behind by earlier attempts")
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f"ignore results cached by a run in the last {CACHE_TTL_SECONDS}s"
+    )
+    args = parser.parse_args()
+    
     print("=" * 60)
     print("🔍 CDK Bootstrap Resource Checker")
     print("=" * 60)
@@ -346,14 +561,19 @@ def main():
         print(f"\n📋 Account: {account_id}")
         print(f"📍 Region:  {region}")
         
-        # Run all checks
-        buckets = check_s3_buckets(account_id, region)
-        repos = check_ecr_repositories(account_id, region)
-        roles = check_iam_roles()
-        params = check_ssm_parameters(region)
-        stacks = check_cloudformation_stacks()
-        keys = check_kms_keys(account_id, region)
-        hooks = check_cloudformation_hooks()
+        cache_path = get_cache_path(account_id, region)
+        cached = None if args.no_cache or cache_path is None else load_cached_results(cache_path)
+        if cached:
+            print(f"\n♻️  Using results cached less than {CACHE_TTL_SECONDS}s ago (pass --no-cache to refresh)")
+            results = cached['results']
+            sys.stdout.write(''.join(cached['reports']))
+        else:
+            results, reports, complete = run_checks(account_id, region)
+            # A run that hit errors is incomplete, so don't let it stand in for the next one
+            if complete and cache_path is not None:
+                save_cached_results(cache_path, results, reports)
+        
+        buckets, repos, roles, params, stacks, keys, hooks = results
         
         # Summary
         print("\n" + "=" * 60)
@@ -6,11 +6,65 @@ This script prompts for CDK parameters and secrets, then deploys the infrastruct
 and configures the secrets in AWS Secrets Manager.
 """
 
+import hashlib
 import json
+import os
+import random
+import shlex
+import shutil
 import subprocess
 import sys
 import getpass
-from typing import Optional, Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    NoCredentialsError,
+    SSOTokenLoadError,
+    TokenRetrievalError,
+    UnauthorizedSSOTokenError,
+    WaiterError,
+)
+
+
+# Local cache for results that rarely change between deploys
+CACHE_DIR = Path.home() / ".cache" / "quip-s3-sync"
+IDENTITY_CACHE_TTL_SECONDS = 600
+# Errors meaning the credentials behind a cached identity are no longer valid
+STALE_CREDENTIALS_ERROR_CODES = {
+    'ExpiredToken', 'ExpiredTokenException', 'RequestExpired', 'InvalidClientTokenId'
+}
+# Raised by botocore before any request is sent, e.g. for an expired SSO login
+STALE_CREDENTIALS_ERRORS = (NoCredentialsError, SSOTokenLoadError, TokenRetrievalError, UnauthorizedSSOTokenError)
+
+# Oldest CDKToolkit bootstrap version the CDK v2 default synthesizer accepts
+MIN_BOOTSTRAP_VERSION = 6
+
+# Written by the CDKToolkit stack (default qualifier); deleted along with it
+BOOTSTRAP_VERSION_PARAMETER = "/cdk-bootstrap/hnb659fds/version"
+
+# Cloud assembly directory shared by cdk synth, diff and deploy
+CDK_OUT_DIR = "cdk.out"
+
+# Object key of the packaged Lambda code in the <account-id>-quip-s3-sync-lambda bucket
+LAMBDA_CODE_KEY = "quip-sync-lambda.zip"
+
+# Alias the schedule invokes; it points at the latest published version
+LAMBDA_ALIAS_NAME = "live"
+
+# The test invoke is synchronous and the function may run for its full 15 minute timeout.
+# Wait longer than that, and never retry: a retried invoke would start a second sync.
+TEST_INVOKE_CONFIG = Config(read_timeout=15 * 60 + 60, retries={'max_attempts': 0})
+
+# Poll every 2 seconds for up to 30 seconds while verifying a fresh deployment
+VERIFY_WAITER_CONFIG = {'Delay': 2, 'MaxAttempts': 15}
 
 
 class Colors:
@@ -22,40 +76,50 @@ class Colors:
     NC = '\033[0m'  # No Color
 
 
+# Skip escape codes entirely when output is piped or redirected
+if not sys.stdout.isatty():
+    Colors.RED = Colors.GREEN = Colors.YELLOW = Colors.BLUE = Colors.NC = ''
+
+INFO_PREFIX = f"{Colors.BLUE}[INFO]{Colors.NC} "
+SUCCESS_PREFIX = f"{Colors.GREEN}[SUCCESS]{Colors.NC} "
+WARNING_PREFIX = f"{Colors.YELLOW}[WARNING]{Colors.NC} "
+ERROR_PREFIX = f"{Colors.RED}[ERROR]{Colors.NC} "
+
+
 def print_info(message: str) -> None:
     """Print info message in blue"""
-    print(f"{Colors.BLUE}[INFO]{Colors.NC} {message}")
+    sys.stdout.write(INFO_PREFIX + message + "\n")
 
 
 def print_success(message: str) -> None:
     """Print success message in green"""
-    print(f"{Colors.GREEN}[SUCCESS]{Colors.NC} {message}")
+    sys.stdout.write(SUCCESS_PREFIX + message + "\n")
 
 
 def print_warning(message: str) -> None:
     """Print warning message in yellow"""
-    print(f"{Colors.YELLOW}[WARNING]{Colors.NC} {message}")
+    sys.stdout.write(WARNING_PREFIX + message + "\n")
 
 
 def print_error(message: str) -> None:
     """Print error message in red"""
-    print(f"{Colors.RED}[ERROR]{Colors.NC} {message}")
+    sys.stdout.write(ERROR_PREFIX + message + "\n")
 
 
-def run_command(command: str, check: bool = True) -> subprocess.CompletedProcess:
-    """Run a shell command and return the result"""
+def run_command(argv: List[str], check: bool = True, env: Optional[Dict[str, str]] = None) -> subprocess.CompletedProcess:
+    """Run a command without a shell and return the result"""
     try:
         result = subprocess.run(
-            command,
-            shell=True,
+            argv,
             capture_output=True,
             text=True,
+            env=env,
             check=check
         )
         return result
     except subprocess.CalledProcessError as e:
         if check:
-            print_error(f"Command failed: {command}")
+            print_error(f"Command failed: {shlex.join(argv)}")
             print_error(f"Error: {e.stderr}")
             raise
         return e
@@ -86,43 +150,160 @@ def prompt_input(prompt: str, required: bool = False, default: str = "", hide_in
         return value
 
 
-def check_aws_cli() -> Dict[str, str]:
-    """Check if AWS CLI is configured and return account info"""
-    print_info("Checking AWS CLI configuration...")
+def write_cache_file(path: Path, content: str) -> None:
+    """Write a cache file atomically, ignoring failures"""
+    # Write atomically so a concurrent run never reads a partial file
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_text(content)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def get_identity_cache_path(session: boto3.Session) -> Path:
+    """Get the identity cache file for the session's profile and credential sources"""
+    # Editing ~/.aws/credentials or ~/.aws/config changes the key, so new credentials
+    # never reuse an identity cached for the old ones
+    source_mtimes = []
+    for env_var, default in (('AWS_SHARED_CREDENTIALS_FILE', '~/.aws/credentials'), ('AWS_CONFIG_FILE', '~/.aws/config')):
+        try:
+            source_mtimes.append(str(Path(os.environ.get(env_var, default)).expanduser().stat().st_mtime_ns))
+        except OSError:
+            source_mtimes.append('')
+    
+    key = ':'.join([session.profile_name, os.environ.get('AWS_ACCESS_KEY_ID', ''), *source_mtimes])
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return CACHE_DIR / f"identity-{digest}.json"
+
+
+def get_account_id(session: boto3.Session) -> Tuple[str, bool]:
+    """Get the caller's account ID and whether it came from a recent cached STS result"""
+    cache_path = get_identity_cache_path(session)
+    
+    try:
+        if time.time() - cache_path.stat().st_mtime < IDENTITY_CACHE_TTL_SECONDS:
+            return json.loads(cache_path.read_text())['account_id'], True
+    except (OSError, ValueError, KeyError):
+        pass
+    
+    account_id = session.client('sts').get_caller_identity()['Account']
+    write_cache_file(cache_path, json.dumps({'account_id': account_id}))
+    
+    return account_id, False
+
+
+def is_stale_credentials_error(error: Exception) -> bool:
+    """Check whether an error means the session's credentials are expired or invalid"""
+    if isinstance(error, STALE_CREDENTIALS_ERRORS):
+        return True
+    return isinstance(error, ClientError) and error.response['Error']['Code'] in STALE_CREDENTIALS_ERROR_CODES
+
+
+@dataclass
+class DeployConfig:
+    """Deployment answers loaded from QUIP_DEPLOY_CONFIG; fields left as None are prompted for"""
+    custom_name: Optional[str] = None
+    aws_region: Optional[str] = None
+    quicksight_principal_id: Optional[str] = None
+    quicksight_namespace: Optional[str] = None
+    service_role_arn: Optional[str] = None
+    quip_access_token: Optional[str] = None
+    folder_ids: Optional[str] = None
+    # Answers to the confirmation prompts
+    bootstrap: Optional[str] = None  # "y", "n" or "skip"
+    continue_without_bootstrap: Optional[bool] = None
+    approve_deployment: Optional[bool] = None  # answers both the configuration and diff confirmations
+    test_deployment: Optional[bool] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'DeployConfig':
+        """Build a config from parsed JSON, rejecting unknown keys and mistyped values"""
+        known = {f.name: f for f in fields(cls)}
+        unknown = sorted(set(data) - set(known))
+        if unknown:
+            raise ValueError(f"unknown key(s): {', '.join(unknown)}")
+        
+        for key, value in data.items():
+            expected = bool if known[key].type == Optional[bool] else str
+            if value is not None and not isinstance(value, expected):
+                raise ValueError(f"'{key}' must be a {'boolean' if expected is bool else 'string'}")
+        
+        if data.get('bootstrap') not in (None, 'y', 'n', 'skip'):
+            raise ValueError("'bootstrap' must be one of \"y\", \"n\" or \"skip\"")
+        
+        return cls(**data)
+
+
+def load_deploy_config() -> DeployConfig:
+    """Load deployment answers from the JSON file named by QUIP_DEPLOY_CONFIG, if set"""
+    config_path = os.environ.get('QUIP_DEPLOY_CONFIG')
+    if not config_path:
+        return DeployConfig()
     
-    # Check if AWS CLI is installed
     try:
-        run_command("aws --version")
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print_error("AWS CLI is not installed. Please install it first.")
+        with open(config_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        print_error(f"Could not read deployment config '{config_path}': {e}")
+        sys.exit(1)
+    
+    if not isinstance(data, dict):
+        print_error(f"Deployment config '{config_path}' must contain a JSON object")
         sys.exit(1)
     
-    # Check if AWS CLI is configured
     try:
-        result = run_command("aws sts get-caller-identity")
-        identity = json.loads(result.stdout)
-        
-        account_id = identity['Account']
+        config = DeployConfig.from_dict(data)
+    except ValueError as e:
+        print_error(f"Invalid deployment config '{config_path}': {e}")
+        sys.exit(1)
+    
+    print_info(f"Using deployment config from {config_path}")
+    return config
+
+
+def config_or_prompt(config: DeployConfig, key: str, prompt: str, **kwargs) -> str:
+    """Use a value from the deployment config, prompting only when it is missing"""
+    value = (getattr(config, key) or "").strip()
+    if value:
+        return value
+    return prompt_input(prompt, **kwargs)
+
+
+def config_choice(answer: Any, prompt: str, default: str) -> str:
+    """Answer a y/n style prompt from the deployment config, prompting only when it is unset"""
+    if answer is None:
+        return prompt_input(prompt, default=default)
+    if isinstance(answer, bool):
+        answer = "y" if answer else "n"
+    print_info(f"{prompt}: {answer} (from deployment config)")
+    return answer
+
+
+def check_aws_credentials(session: boto3.Session) -> Dict[str, str]:
+    """Check that AWS credentials are configured and return account info"""
+    print_info("Checking AWS credentials...")
+    
+    # Check if AWS credentials are configured
+    try:
+        account_id, cached = get_account_id(session)
         
         # Get region - use us-east-1 as fallback if not configured
-        try:
-            region_result = run_command("aws configure get region", check=False)
-            region = region_result.stdout.strip() if region_result.returncode == 0 else ""
-            if not region:
-                region = "us-east-1"
-        except subprocess.CalledProcessError:
-            region = "us-east-1"
+        region = session.region_name or "us-east-1"
         
-        print_success(f"AWS CLI configured for account: {account_id} in region: {region}")
+        # A cached identity is only confirmed by the first real AWS call (see main)
+        source = " (cached identity)" if cached else ""
+        print_success(f"AWS credentials configured for account: {account_id} in region: {region}{source}")
         
         return {
             'account_id': account_id,
             'region': region
         }
         
-    except subprocess.CalledProcessError:
-        print_error("AWS CLI is not configured or credentials are invalid.")
-        print_info("Please run 'aws configure' to set up your credentials.")
+    except (BotoCoreError, ClientError):
+        print_error("AWS credentials are not configured or are invalid.")
+        print_info("Configure credentials with environment variables, a shared credentials file, or 'aws configure'.")
         sys.exit(1)
 
 
@@ -130,30 +311,61 @@ def check_cdk() -> None:
     """Check if CDK is installed"""
     print_info("Checking CDK installation...")
     
-    try:
-        result = run_command("cdk --version")
-        print_success(f"CDK installed: {result.stdout.strip()}")
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    cdk_path = shutil.which("cdk")
+    if cdk_path is None:
         print_error("AWS CDK is not installed. Please install it first:")
         print_info("npm install -g aws-cdk")
         sys.exit(1)
+    
+    print_success(f"CDK installed: {cdk_path}")
 
 
-def bootstrap_cdk(region: str, account_id: str) -> None:
+def bootstrap_cdk(session: boto3.Session, region: str, account_id: str, config: DeployConfig) -> None:
     """Bootstrap CDK if needed"""
     print_info("Checking if CDK bootstrap is required...")
     
-    region_flag = f"--region {region}" if region else ""
+    # A marker from a previous run records the bootstrap version; confirm it with a cheap
+    # SSM read, since the CDKToolkit stack may have been deleted since (see check_cdk_resources.py)
+    marker_path = CACHE_DIR / f"bootstrapped-{account_id}-{region}"
+    try:
+        cached_version = marker_path.read_text()
+    except OSError:
+        cached_version = None
+    
+    if cached_version is not None:
+        ssm = session.client('ssm', region_name=region or None)
+        try:
+            current_version = ssm.get_parameter(Name=BOOTSTRAP_VERSION_PARAMETER)['Parameter']['Value']
+        except ClientError as e:
+            if is_stale_credentials_error(e):
+                raise
+            current_version = None
+        
+        if current_version == cached_version and current_version.isdigit() and int(current_version) >= MIN_BOOTSTRAP_VERSION:
+            print_success(f"CDK already bootstrapped (version {current_version})")
+            return
+        
+        # Bootstrap stack is gone, changed or unreadable; fall back to the full check
+        marker_path.unlink(missing_ok=True)
+    
+    cloudformation = session.client('cloudformation', region_name=region or None)
     
     # Check if bootstrap stack exists
     try:
-        run_command(f"aws cloudformation describe-stacks --stack-name CDKToolkit {region_flag}")
+        stack = cloudformation.describe_stacks(StackName="CDKToolkit")['Stacks'][0]
         print_success("CDK already bootstrapped")
-    except subprocess.CalledProcessError:
+        
+        outputs = {o['OutputKey']: o['OutputValue'] for o in stack.get('Outputs', [])}
+        if outputs.get('BootstrapVersion', '').isdigit():
+            write_cache_file(marker_path, outputs['BootstrapVersion'])
+    except ClientError as e:
+        # Bad credentials say nothing about the bootstrap stack; let main re-check them
+        if is_stale_credentials_error(e):
+            raise
         print_warning("CDK bootstrap required")
         print_info("Note: If your account has CloudFormation hooks enabled, bootstrap may fail.")
         print_info("You can skip bootstrap now and manually bootstrap later if needed.")
-        choice = prompt_input("Do you want to bootstrap CDK now? (y/n/skip)", default="skip")
+        choice = config_choice(config.bootstrap, "Do you want to bootstrap CDK now? (y/n/skip)", default="skip")
         
         if choice.lower() == 'skip':
             print_warning("Skipping CDK bootstrap. Make sure to bootstrap manually if deployment fails.")
@@ -163,21 +375,19 @@ def bootstrap_cdk(region: str, account_id: str) -> None:
             print_info("Bootstrapping CDK...")
             # Bootstrap with explicit environment to avoid loading app.py
             # Use --app flag to prevent CDK from loading our app.py
-            import os
             env = os.environ.copy()
             if region:
                 env['AWS_DEFAULT_REGION'] = region
                 # Use a dummy app to prevent loading app.py which requires customName
                 # Add --execute to bypass changeset and execute directly (avoids hooks)
-                bootstrap_cmd = f"cdk bootstrap aws://{account_id}/{region} --app 'echo {{}}' --execute"
+                bootstrap_cmd = ["cdk", "bootstrap", f"aws://{account_id}/{region}", "--app", "echo {}", "--execute"]
             else:
-                bootstrap_cmd = "cdk bootstrap --app 'echo {}' --execute"
+                bootstrap_cmd = ["cdk", "bootstrap", "--app", "echo {}", "--execute"]
             
             # Run with modified environment
             try:
                 result = subprocess.run(
                     bootstrap_cmd,
-                    shell=True,
                     capture_output=True,
                     text=True,
                     env=env,
@@ -185,7 +395,7 @@ def bootstrap_cdk(region: str, account_id: str) -> None:
                 )
                 print_success("CDK bootstrap completed")
             except subprocess.CalledProcessError as e:
-                print_error(f"Command failed: {bootstrap_cmd}")
+                print_error(f"Command failed: {shlex.join(bootstrap_cmd)}")
                 print_error(f"Error output: {e.stderr}")
                 if e.stdout:
                     print_error(f"Standard output: {e.stdout}")
@@ -195,7 +405,11 @@ def bootstrap_cdk(region: str, account_id: str) -> None:
                 print_info("1. Contact your AWS administrator to temporarily disable the CloudFormation hook")
                 print_info("2. Skip bootstrap and try deployment anyway (it may work if bootstrap was done previously)")
                 print()
-                skip_choice = prompt_input("Do you want to skip bootstrap and continue? (y/n)", default="y")
+                skip_choice = config_choice(
+                    config.continue_without_bootstrap,
+                    "Do you want to skip bootstrap and continue? (y/n)",
+                    default="y"
+                )
                 if skip_choice.lower() in ['y', 'yes']:
                     print_warning("Continuing without bootstrap. Deployment may fail if bootstrap is required.")
                     return
@@ -265,7 +479,7 @@ def validate_custom_name(custom_name: str) -> str:
     return custom_name
 
 
-def collect_cdk_parameters(current_region: str) -> Dict[str, str]:
+def collect_cdk_parameters(current_region: str, config: DeployConfig) -> Dict[str, str]:
     """Collect CDK deployment parameters from user"""
     print_info("Collecting CDK deployment parameters...")
     print()
@@ -275,7 +489,9 @@ def collect_cdk_parameters(current_region: str) -> Dict[str, str]:
     
     # Prompt for custom name with validation
     while True:
-        custom_name = prompt_input(
+        custom_name = config_or_prompt(
+            config,
+            'custom_name',
             "Knowledge base name e.g. accounts (lower case with hyphens only - will be used for all AWS resource names)",
             required=True
         )
@@ -286,10 +502,13 @@ def collect_cdk_parameters(current_region: str) -> Dict[str, str]:
         except ValueError as e:
             print_error(f"Invalid custom name: {e}")
             print_info("Please try again with a different name")
+            config.custom_name = None
     
     print()
     print_info("AWS Configuration:")
-    params['aws_region'] = prompt_input(
+    params['aws_region'] = config_or_prompt(
+        config,
+        'aws_region',
         "AWS Region for deployment", 
         default=current_region
     )
@@ -297,15 +516,21 @@ def collect_cdk_parameters(current_region: str) -> Dict[str, str]:
     print()
     print_info("QuickSight Configuration (required for bucket policy creation):")
     
-    params['quicksight_principal_id'] = prompt_input(
+    params['quicksight_principal_id'] = config_or_prompt(
+        config,
+        'quicksight_principal_id',
         "QuickSight Principal ID (e.g., user/d-xxx/S-1-5-21-xxx)",
         required=True
     )
-    params['quicksight_namespace'] = prompt_input(
+    params['quicksight_namespace'] = config_or_prompt(
+        config,
+        'quicksight_namespace',
         "QuickSight Namespace", 
         default="default"
     )
-    params['service_role_arn'] = prompt_input(
+    params['service_role_arn'] = config_or_prompt(
+        config,
+        'service_role_arn',
         "QuickSight Service Role ARN (e.g., arn:aws:iam::123456789012:role/service-role/aws-quicksight-service-role-v0)",
         required=True
     )
@@ -316,7 +541,7 @@ def collect_cdk_parameters(current_region: str) -> Dict[str, str]:
     return params
 
 
-def collect_secrets(custom_name: str) -> Dict[str, str]:
+def collect_secrets(custom_name: str, config: DeployConfig) -> Dict[str, str]:
     """Collect secrets configuration from user"""
     print_info("Collecting Secrets Manager configuration...")
     print()
@@ -325,59 +550,118 @@ def collect_secrets(custom_name: str) -> Dict[str, str]:
     secret_name = f"quip-sync-{custom_name}-credentials"
     
     secrets = {}
-    secrets['quip_access_token'] = prompt_input(
+    secrets['quip_access_token'] = config_or_prompt(
+        config,
+        'quip_access_token',
         "Quip Access Token (Bearer token)", 
         required=True
     )
-    secrets['folder_ids'] = prompt_input(
+    secrets['folder_ids'] = config_or_prompt(
+        config,
+        'folder_ids',
         "Quip Folder IDs (comma-separated)", 
         required=True
     )
     secrets['secret_name'] = secret_name
+    secrets['parameter_name'] = f"/quip-sync/{custom_name}/folder-ids"
     
     print_info(f"Secret will be created/updated with name: {secret_name}")
+    print_info(f"Folder IDs will be stored in parameter: {secrets['parameter_name']}")
     
     return secrets
 
 
-def deploy_cdk(params: Dict[str, str]) -> None:
-    """Deploy the CDK stack"""
-    print_info("Starting CDK deployment...")
+def get_lambda_code_version(session: boto3.Session, region: str, account_id: str) -> Optional[str]:
+    """Get the S3 object version of the uploaded Lambda package, if the code bucket is versioned"""
+    bucket_name = f"{account_id}-quip-s3-sync-lambda"
+    s3 = session.client('s3', region_name=region or None)
     
-    # Set AWS region if different from current
-    region_env = ""
-    if params['aws_region']:
-        region_env = f"AWS_DEFAULT_REGION={params['aws_region']} "
+    try:
+        version_id = s3.head_object(Bucket=bucket_name, Key=LAMBDA_CODE_KEY).get('VersionId')
+    except ClientError as e:
+        print_warning(f"Could not read s3://{bucket_name}/{LAMBDA_CODE_KEY}: {e}")
+        return None
+    
+    # Unversioned buckets report no version (or the literal "null")
+    if not version_id or version_id == 'null':
+        print_warning(f"Bucket {bucket_name} is not versioned; re-uploaded code will not reach the 'live' alias")
+        print_info(f"Enable versioning: aws s3api put-bucket-versioning --bucket {bucket_name} --versioning-configuration Status=Enabled")
+        return None
     
+    print_info(f"Deploying Lambda package version {version_id}")
+    return version_id
+
+
+def get_cdk_env(params: Dict[str, str]) -> Optional[Dict[str, str]]:
+    """Get the environment for cdk commands, targeting the deployment region"""
+    # Set AWS region if different from current
+    if not params['aws_region']:
+        return None
+    env = os.environ.copy()
+    env['AWS_DEFAULT_REGION'] = params['aws_region']
+    return env
+
+
+def start_cdk_synth(params: Dict[str, str]) -> subprocess.Popen:
+    """Start synthesizing the CDK app in the background"""
     # Build CDK context parameters
     cdk_context = []
     
     # Add custom name (required)
-    cdk_context.append(f'--context customName="{params["custom_name"]}"')
+    cdk_context += ["--context", f"customName={params['custom_name']}"]
     
     if params['quicksight_principal_id']:
-        cdk_context.append(f'--context quicksightPrincipalId="{params["quicksight_principal_id"]}"')
+        cdk_context += ["--context", f"quicksightPrincipalId={params['quicksight_principal_id']}"]
     
     if params['quicksight_namespace']:
-        cdk_context.append(f'--context quicksightNamespace="{params["quicksight_namespace"]}"')
+        cdk_context += ["--context", f"quicksightNamespace={params['quicksight_namespace']}"]
     
     if params['service_role_arn']:
-        cdk_context.append(f'--context serviceRoleArn="{params["service_role_arn"]}"')
+        cdk_context += ["--context", f"serviceRoleArn={params['service_role_arn']}"]
+    else:
+        # No service role, so leave the QuickSight bucket policy out of the template entirely
+        cdk_context += ["--context", "enableQuickSightPolicy=false"]
+    
+    # A new package version publishes a new Lambda version for the live alias
+    if params.get('lambda_code_version'):
+        cdk_context += ["--context", f"lambdaCodeVersion={params['lambda_code_version']}"]
+    
+    # Synthesize once; diff and deploy both reuse the cloud assembly
+    synth_command = ["cdk", "synth", params['stack_name'], *cdk_context, "--quiet", "--output", CDK_OUT_DIR]
+    return subprocess.Popen(
+        synth_command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        env=get_cdk_env(params)
+    )
+
+
+def deploy_cdk(params: Dict[str, str], synth_process: subprocess.Popen, config: DeployConfig) -> None:
+    """Deploy the CDK stack"""
+    print_info("Starting CDK deployment...")
+    
+    env = get_cdk_env(params)
     
-    cdk_params_str = ' '.join(cdk_context)
+    print_info("Waiting for CDK synthesis to finish...")
+    _, synth_stderr = synth_process.communicate()
+    if synth_process.returncode != 0:
+        print_error(f"Command failed: {shlex.join(synth_process.args)}")
+        print_error(f"Error: {synth_stderr}")
+        raise subprocess.CalledProcessError(synth_process.returncode, synth_process.args, stderr=synth_stderr)
     
     # Show what will be deployed
     print_info("Running CDK diff to show planned changes...")
-    diff_command = f"{region_env}cdk diff {params['stack_name']} {cdk_params_str}"
-    print(f"Command: {diff_command}")
+    diff_command = ["cdk", "diff", params['stack_name'], "--app", CDK_OUT_DIR]
+    print(f"Command: {shlex.join(diff_command)}")
     
     try:
-        run_command(diff_command, check=False)
+        run_command(diff_command, check=False, env=env)
     except Exception:
         pass  # CDK diff might fail, but that's okay
     
     print()
-    choice = prompt_input("Do you want to proceed with the deployment? (y/n)", default="y")
+    choice = config_choice(config.approve_deployment, "Do you want to proceed with the deployment? (y/n)", default="y")
     
     if choice.lower() not in ['y', 'yes']:
         print_warning("Deployment cancelled by user.")
@@ -385,116 +669,158 @@ def deploy_cdk(params: Dict[str, str]) -> None:
     
     # Deploy the stack
     print_info("Deploying CDK stack...")
-    deploy_command = f"{region_env}cdk deploy {params['stack_name']} {cdk_params_str} --require-approval never"
-    run_command(deploy_command)
+    deploy_command = ["cdk", "deploy", params['stack_name'], "--app", CDK_OUT_DIR, "--require-approval", "never"]
+    run_command(deploy_command, env=env)
     
     print_success("CDK deployment completed successfully!")
 
 
-def update_secrets(secrets: Dict[str, str], region: str) -> None:
-    """Update AWS Secrets Manager"""
+def update_secrets(session: boto3.Session, secrets: Dict[str, str], region: str) -> None:
+    """Update AWS Secrets Manager and the folder IDs SSM parameter"""
     print_info("Updating AWS Secrets Manager...")
     
-    # Create the secret JSON
+    # Create the secret JSON; folder IDs are not sensitive and live in SSM instead
     secret_json = {
-        "quip_access_token": secrets['quip_access_token'],
-        "folder_ids": secrets['folder_ids']
+        "quip_access_token": secrets['quip_access_token']
     }
     
     secret_string = json.dumps(secret_json)
-    region_flag = f"--region {region}" if region else ""
+    secretsmanager = session.client('secretsmanager', region_name=region or None)
     
     # Check if secret exists
     try:
-        run_command(f'aws secretsmanager describe-secret --secret-id "{secrets["secret_name"]}" {region_flag}')
+        secretsmanager.describe_secret(SecretId=secrets['secret_name'])
         print_info(f"Secret '{secrets['secret_name']}' exists. Updating...")
         
-        run_command(f'''aws secretsmanager update-secret \
-            --secret-id "{secrets['secret_name']}" \
-            --secret-string '{secret_string}' {region_flag}''')
+        # put_secret_value only writes a new version; botocore fills in an
+        # idempotent ClientRequestToken so retried calls don't duplicate it
+        secretsmanager.put_secret_value(
+            SecretId=secrets['secret_name'],
+            SecretString=secret_string
+        )
         
         print_success("Secret updated successfully!")
         
-    except subprocess.CalledProcessError:
+    except secretsmanager.exceptions.ResourceNotFoundException:
         print_info(f"Secret '{secrets['secret_name']}' does not exist. Creating...")
         
-        run_command(f'''aws secretsmanager create-secret \
-            --name "{secrets['secret_name']}" \
-            --description "Quip access token and folder IDs for sync system" \
-            --secret-string '{secret_string}' {region_flag}''')
+        secretsmanager.create_secret(
+            Name=secrets['secret_name'],
+            Description="Quip access token for sync system",
+            SecretString=secret_string
+        )
         
         print_success("Secret created successfully!")
+    
+    ssm = session.client('ssm', region_name=region or None)
+    ssm.put_parameter(
+        Name=secrets['parameter_name'],
+        Value=secrets['folder_ids'],
+        Type='String',
+        Overwrite=True
+    )
+    
+    print_success(f"Parameter '{secrets['parameter_name']}' updated successfully!")
+
 
+def wait_for_secret(secretsmanager: Any, secret_name: str, max_attempts: int = 5) -> None:
+    """Wait for a secret to become visible, backing off with jitter between attempts"""
+    for attempt in range(max_attempts):
+        try:
+            secretsmanager.describe_secret(SecretId=secret_name)
+            return
+        except secretsmanager.exceptions.ResourceNotFoundException:
+            if attempt == max_attempts - 1:
+                raise
+            time.sleep(min(2 ** attempt, 8) * random.uniform(0.5, 1.0))
 
-def verify_deployment(stack_name: str, secret_name: str, aws_info: Dict[str, str], region: str, custom_name: str, service_role_arn: str = "") -> None:
+
+def verify_deployment(session: boto3.Session, stack_name: str, secret_name: str, aws_info: Dict[str, str], region: str, custom_name: str, service_role_arn: str = "") -> None:
     """Verify the deployment"""
     print_info("Verifying deployment...")
     
-    region_flag = f"--region {region}" if region else ""
+    region_name = region or None
     
-    # Check if stack exists
-    try:
-        run_command(f'aws cloudformation describe-stacks --stack-name "{stack_name}" {region_flag}')
-        print_success(f"CloudFormation stack '{stack_name}' is active")
-        
-        # Check if bucket policy exists (if QuickSight parameters were provided)
-        if service_role_arn:
-            bucket_name = f"{aws_info['account_id']}-quip-sync-{custom_name}"
-            try:
-                run_command(f'aws s3api get-bucket-policy --bucket "{bucket_name}" {region_flag}')
-                print_success("S3 bucket policy applied successfully")
-            except subprocess.CalledProcessError:
-                print_warning("S3 bucket policy not found (this may be expected if parameters were not provided)")
-        
-    except subprocess.CalledProcessError:
-        print_error(f"CloudFormation stack '{stack_name}' not found")
+    # The three checks below run on worker threads, so build their clients here on the main thread
+    cloudformation = session.client('cloudformation', region_name=region_name)
+    s3 = session.client('s3', region_name=region_name)
+    secretsmanager = session.client('secretsmanager', region_name=region_name)
+    
+    def check_stack():
+        try:
+            cloudformation.get_waiter('stack_exists').wait(
+                StackName=stack_name,
+                WaiterConfig=VERIFY_WAITER_CONFIG
+            )
+            return True, print_success, f"CloudFormation stack '{stack_name}' is active"
+        except (ClientError, WaiterError):
+            return False, print_error, f"CloudFormation stack '{stack_name}' not found"
+    
+    def check_bucket_policy():
+        bucket_name = f"{aws_info['account_id']}-quip-sync-{custom_name}"
+        try:
+            s3.get_waiter('bucket_exists').wait(Bucket=bucket_name, WaiterConfig=VERIFY_WAITER_CONFIG)
+            s3.get_bucket_policy(Bucket=bucket_name)
+            return True, print_success, "S3 bucket policy applied successfully"
+        except (ClientError, WaiterError):
+            return False, print_warning, "S3 bucket policy not found (this may be expected if parameters were not provided)"
+    
+    def check_secret():
+        try:
+            wait_for_secret(secretsmanager, secret_name)
+            return True, print_success, f"Secret '{secret_name}' is configured"
+        except ClientError:
+            return False, print_error, f"Secret '{secret_name}' not found"
+    
+    # The checks are independent, so run them together and report in a fixed order
+    checks = [check_stack, check_secret]
+    # Check if bucket policy exists (if QuickSight parameters were provided)
+    if service_role_arn:
+        checks.insert(1, check_bucket_policy)
+    
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        results = list(executor.map(lambda check: check(), checks))
+    
+    stack_ok, printer, message = results[0]
+    printer(message)
+    if not stack_ok:
         return
     
-    # Check secret
-    try:
-        run_command(f'aws secretsmanager describe-secret --secret-id "{secret_name}" {region_flag}')
-        print_success(f"Secret '{secret_name}' is configured")
-    except subprocess.CalledProcessError:
-        print_error(f"Secret '{secret_name}' not found")
+    for _, printer, message in results[1:]:
+        printer(message)
 
 
-def test_deployment(region: str, custom_name: str) -> None:
+def test_deployment(session: boto3.Session, region: str, custom_name: str) -> None:
     """Test the Lambda function"""
     print_info("Testing Lambda function...")
     
     lambda_function_name = f"quip-sync-{custom_name}-function"
-    region_flag = f"--region {region}" if region else ""
+    lambda_client = session.client('lambda', region_name=region or None, config=TEST_INVOKE_CONFIG)
     
     try:
-        print_info("Invoking Lambda function for test...")
+        print_info(f"Invoking Lambda function ({LAMBDA_ALIAS_NAME} alias) for test...")
         
-        result = run_command(f'''aws lambda invoke \
-            --function-name "{lambda_function_name}" \
-            --payload '{{}}' \
-            --cli-binary-format raw-in-base64-out \
-            {region_flag} \
-            response.json''')
+        # Invoke the alias the schedule uses; $LATEST may not match the published version
+        result = lambda_client.invoke(
+            FunctionName=lambda_function_name,
+            Qualifier=LAMBDA_ALIAS_NAME,
+            Payload=b'{}'
+        )
         
         print_success("Lambda function invoked successfully")
         
         # Show response
         try:
-            with open('response.json', 'r') as f:
-                response = json.load(f)
-                print_info("Lambda response:")
-                print(json.dumps(response, indent=2))
-        except (FileNotFoundError, json.JSONDecodeError):
+            response = json.loads(result['Payload'].read())
+            print_info("Lambda response:")
+            print(json.dumps(response, indent=2))
+        except json.JSONDecodeError:
             print_warning("Could not read Lambda response")
-        finally:
-            # Clean up response file
-            try:
-                import os
-                os.remove('response.json')
-            except FileNotFoundError:
-                pass
                 
-    except subprocess.CalledProcessError:
-        print_warning("Lambda function test failed (this may be expected if Quip credentials are not valid yet)")
+    except (BotoCoreError, ClientError) as e:
+        # The deployment itself succeeded, so a failed test only warrants a warning
+        print_warning(f"Lambda function test failed: {e}")
+        print_info("This may be expected if Quip credentials are not valid yet")
 
 
 def main() -> None:
@@ -504,72 +830,114 @@ def main() -> None:
     print("=" * 50)
     print()
     
-    # Pre-flight checks
-    aws_info = check_aws_cli()
-    check_cdk()
-    bootstrap_cdk(aws_info['region'], aws_info['account_id'])
+    # Answers from QUIP_DEPLOY_CONFIG replace the matching prompts
+    config = load_deploy_config()
+    
+    # Single session shared by every AWS call in this run
+    session = boto3.Session()
+    
+    # Pre-flight checks - the AWS and CDK checks are independent, so overlap them
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        aws_future = executor.submit(check_aws_credentials, session)
+        cdk_future = executor.submit(check_cdk)
+        aws_info = aws_future.result()
+        cdk_future.result()
+    
+    # The bootstrap check is the first real AWS call. If it shows the credentials behind a
+    # cached identity have gone stale, drop the cache, re-resolve credentials and retry once.
+    try:
+        bootstrap_cdk(session, aws_info['region'], aws_info['account_id'], config)
+    except (BotoCoreError, ClientError) as e:
+        if not is_stale_credentials_error(e):
+            raise
+        print_warning("AWS credentials are expired or have changed; checking them again...")
+        get_identity_cache_path(session).unlink(missing_ok=True)
+        session = boto3.Session()
+        aws_info = check_aws_credentials(session)
+        bootstrap_cdk(session, aws_info['region'], aws_info['account_id'], config)
     
     print()
     print_info("Starting interactive deployment configuration...")
     print()
     
     # Collect parameters
-    cdk_params = collect_cdk_parameters(aws_info['region'])
-    secrets = collect_secrets(cdk_params['custom_name'])
+    cdk_params = collect_cdk_parameters(aws_info['region'], config)
     
-    # Confirmation
-    print()
-    print_info("Deployment Summary:")
-    print(f"  Custom Name: {cdk_params['custom_name']}")
-    print(f"  Stack Name: {cdk_params['stack_name']}")
-    print(f"  AWS Account: {aws_info['account_id']}")
-    print(f"  AWS Region: {cdk_params['aws_region']}")
-    print(f"  S3 Bucket Name: {aws_info['account_id']}-quip-sync-{cdk_params['custom_name']}")
-    print(f"  Secret Name: {secrets['secret_name']}")
-    
-    print(f"  QuickSight Principal: {cdk_params['quicksight_principal_id']}")
-    print(f"  QuickSight Namespace: {cdk_params['quicksight_namespace']}")
-    print(f"  Service Role ARN: {cdk_params['service_role_arn']}")
-    print_info("Bucket policy will be created for QuickSight access")
-    
-    print()
-    final_confirm = prompt_input("Do you want to proceed with this configuration? (y/n)", default="y")
+    cdk_params['lambda_code_version'] = get_lambda_code_version(session, cdk_params['aws_region'], aws_info['account_id'])
     
-    if final_confirm.lower() not in ['y', 'yes']:
-        print_warning("Deployment cancelled by user.")
-        sys.exit(0)
+    # Synthesis only needs the CDK parameters, so run it while collecting the rest
+    synth_process = start_cdk_synth(cdk_params)
     
-    # Execute deployment
-    print()
+    # Stop the background synth on every exit path before deploy_cdk has collected it, so it
+    # is not left running (and writing to cdk.out) after a prompt fails or is cancelled
     try:
-        deploy_cdk(cdk_params)
-        update_secrets(secrets, cdk_params['aws_region'])
-        verify_deployment(
-            cdk_params['stack_name'], 
-            secrets['secret_name'], 
-            aws_info,
-            cdk_params['aws_region'], 
-            cdk_params['custom_name'],
-            cdk_params['service_role_arn']
-        )
+        secrets = collect_secrets(cdk_params['custom_name'], config)
         
+        # Confirmation
         print()
-        print_success("Deployment completed successfully!")
+        print_info("Deployment Summary:")
+        print(f"  Custom Name: {cdk_params['custom_name']}")
+        print(f"  Stack Name: {cdk_params['stack_name']}")
+        print(f"  AWS Account: {aws_info['account_id']}")
+        print(f"  AWS Region: {cdk_params['aws_region']}")
+        print(f"  S3 Bucket Name: {aws_info['account_id']}-quip-sync-{cdk_params['custom_name']}")
+        print(f"  Secret Name: {secrets['secret_name']}")
+        print(f"  Folder IDs Parameter: {secrets['parameter_name']}")
         
-        # Optional testing
-        print()
-        test_choice = prompt_input("Do you want to test the Lambda function? (y/n)", default="n")
-        if test_choice.lower() in ['y', 'yes']:
-            test_deployment(cdk_params['aws_region'], cdk_params['custom_name'])
+        print(f"  QuickSight Principal: {cdk_params['quicksight_principal_id']}")
+        print(f"  QuickSight Namespace: {cdk_params['quicksight_namespace']}")
+        print(f"  Service Role ARN: {cdk_params['service_role_arn']}")
+        if cdk_params['service_role_arn']:
+            print_info("Bucket policy will be created for QuickSight access")
+        else:
+            print_info("No service role ARN given; the QuickSight bucket policy will be left out")
         
         print()
-        print_success("All done! Your Quip-S3 sync system is ready.")
-        print_info("The system will run automatically based on the EventBridge schedule.")
-        print_info("Check CloudWatch logs for execution details.")
+        final_confirm = config_choice(config.approve_deployment, "Do you want to proceed with this configuration? (y/n)", default="y")
         
-    except Exception as e:
-        print_error(f"Deployment failed: {str(e)}")
-        sys.exit(1)
+        if final_confirm.lower() not in ['y', 'yes']:
+            print_warning("Deployment cancelled by user.")
+            sys.exit(0)
+        
+        # Execute deployment
+        print()
+        try:
+            deploy_cdk(cdk_params, synth_process, config)
+            update_secrets(session, secrets, cdk_params['aws_region'])
+            verify_deployment(
+                session,
+                cdk_params['stack_name'], 
+                secrets['secret_name'], 
+                aws_info,
+                cdk_params['aws_region'], 
+                cdk_params['custom_name'],
+                cdk_params['service_role_arn']
+            )
+            
+            print()
+            print_success("Deployment completed successfully!")
+            
+            # Optional testing
+            print()
+            test_choice = config_choice(config.test_deployment, "Do you want to test the Lambda function? (y/n)", default="n")
+            if test_choice.lower() in ['y', 'yes']:
+                test_deployment(session, cdk_params['aws_region'], cdk_params['custom_name'])
+            
+            print()
+            print_success("All done! Your Quip-S3 sync system is ready.")
+            print_info("The system will run automatically based on the EventBridge schedule.")
+            print_info("Check CloudWatch logs for execution details.")
+            
+        except Exception as e:
+            print_error(f"Deployment failed: {str(e)}")
+            # Expired credentials mean the cached identity can't be trusted either
+            if is_stale_credentials_error(e):
+                get_identity_cache_path(session).unlink(missing_ok=True)
+            sys.exit(1)
+    finally:
+        if synth_process.poll() is None:
+            synth_process.terminate()
+            synth_process.wait()
 
 
 if __name__ == "__main__":
@@ -390,6 +390,7 @@ test_deployment() {
     
     INVOKE_RESULT=$(aws lambda invoke \
         --function-name "$LAMBDA_FUNCTION_NAME" \
+        --qualifier live \
         --payload '{}' \
         --cli-binary-format raw-in-base64-out \
         $REGION_FLAG \
@@ -11,20 +11,32 @@ from aws_cdk import (
     CfnCondition,
     Fn,
     Tags,
-    BundlingOptions,
     SecretValue,
     aws_lambda as _lambda,
+    aws_ec2 as ec2,
     aws_s3 as s3,
-    aws_events as events,
-    aws_events_targets as targets,
+    aws_scheduler as scheduler,
     aws_iam as iam,
     aws_secretsmanager as secretsmanager,
+    aws_ssm as ssm,
     aws_logs as logs,
     aws_cloudwatch as cloudwatch,
+    aws_cloudwatch_actions as cloudwatch_actions,
     aws_sns as sns,
 )
 from constructs import Construct
-import json
+
+
+# custom_name character rules in a single pattern:
+# - Only lowercase letters, numbers, and hyphens
+# - Must start and end with letter or number
+# - Cannot contain consecutive hyphens
+_CUSTOM_NAME_RE = re.compile(r'(?!.*--)[a-z0-9](?:[a-z0-9-]*[a-z0-9])?')
+_IP_ADDRESS_RE = re.compile(r'\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}')
+_RESERVED_WORDS_RE = re.compile(r'aws|amazon|amzn')
+
+# CloudWatch namespace for the application metrics the Lambda function emits (AWS/* is reserved)
+METRICS_NAMESPACE = "QuipSync"
 
 
 class QuipSyncStack(Stack):
@@ -40,6 +52,14 @@ class QuipSyncStack(Stack):
         quicksight_principal_id: Optional[str] = None,
         quicksight_namespace: str = "default",
         service_role_arn: Optional[str] = None,
+        enable_quicksight_policy: bool = True,
+        vpc_id: Optional[str] = None,
+        create_s3_endpoint: bool = True,
+        lambda_code_bucket: Optional[s3.IBucket] = None,
+        lambda_code_version: Optional[str] = None,
+        lambda_memory_mb: int = 1769,
+        quip_max_workers: int = 8,
+        enable_alarm_notifications: bool = False,
         **kwargs
     ) -> None:
         """
@@ -52,10 +72,29 @@ class QuipSyncStack(Stack):
             quicksight_principal_id: QuickSight principal ID for S3 access
             quicksight_namespace: QuickSight namespace
             service_role_arn: QuickSight service role ARN
+            enable_quicksight_policy: Include the QuickSight bucket policy when no service role ARN
+                is given at synth time, so the ARN can be supplied as a deploy-time parameter; turn
+                off when the deployment is known to have no service role
+            vpc_id: Optional VPC to run the Lambda function in (requires an explicit stack env)
+            create_s3_endpoint: Add an S3 gateway endpoint to the VPC; turn off when the VPC
+                already has one, since a second S3 gateway endpoint fails to deploy
+            lambda_code_bucket: Optional existing reference to the Lambda code bucket, so apps
+                with several stacks can share one; defaults to <account-id>-quip-s3-sync-lambda
+            lambda_code_version: S3 object version of quip-sync-lambda.zip. A new value changes the
+                synthesized function, which publishes a new version and moves the live alias to it
+            lambda_memory_mb: Memory (MB) for the sync Lambda function, 256-3008; 1769 MB provides
+                one full vCPU. Like the code version, a new value publishes a new version
+            quip_max_workers: Maximum number of concurrent Quip API requests made by the function
+            enable_alarm_notifications: Create an SNS topic and notify it when the health alarm fires
             **kwargs: Additional stack arguments
         """
         super().__init__(scope, construct_id, **kwargs)
         
+        # Shared tags are applied once at the stack root and propagate to every taggable resource
+        Tags.of(self).add("Purpose", "QuipSync")
+        Tags.of(self).add("Application", "QuipS3Sync")
+        Tags.of(self).add("Environment", "Production")
+        
         # Create CDK parameter for custom name
         self.custom_name_param = CfnParameter(
             self, "customName",
@@ -67,6 +106,10 @@ class QuipSyncStack(Stack):
         # Validate custom_name follows AWS naming conventions
         self.custom_name = self._validate_custom_name(custom_name)
         
+        # Powertools service name; also the dimension the custom metric alarms select on
+        self.service_name = f"quip-sync-{self.custom_name}"
+        self._metric_dimensions = {"service": self.service_name}
+        
         # Create CDK parameters for configurable Quick Suite access
         self.quicksight_principal_param = CfnParameter(
             self, "quicksightPrincipalId",
@@ -105,20 +148,39 @@ class QuipSyncStack(Stack):
             default=""
         )
         
+        # Memory is tuned per deployment with AWS Lambda Power Tuning (see README). It is a
+        # synth-time value rather than a CfnParameter so that a change is part of the function's
+        # version hash and reaches the live alias
+        if not 256 <= lambda_memory_mb <= 3008:
+            raise ValueError("lambda_memory_mb must be between 256 and 3008")
+        self.lambda_memory_mb = lambda_memory_mb
+        self.quip_max_workers = quip_max_workers
+        
         # Create S3 bucket with dynamic name format: <AWS Account ID>-quip-sync
         self.bucket = self._create_s3_bucket()
         
+        # Create bucket policy for QuickSight access unless the deployment is known to have no
+        # service role; the policy itself is still conditional on the deploy-time parameter
+        if service_role_arn or enable_quicksight_policy:
+            self._create_bucket_policy(self.bucket)
+        
         # Create Secrets Manager secret for Quip credentials
         self.secret = self._create_secrets_manager_secret()
         
+        # Create SSM parameter for the (non-sensitive) folder IDs
+        self.folder_ids_parameter = self._create_folder_ids_parameter()
+        
+        # Look up the VPC (with an S3 gateway endpoint) only when the function is placed in one
+        self.vpc = self._create_vpc_endpoints(vpc_id, create_s3_endpoint) if vpc_id else None
+        
         # Create Lambda function with specified configuration
-        self.lambda_function = self._create_lambda_function()
+        self.lambda_function = self._create_lambda_function(lambda_code_bucket, lambda_code_version)
         
-        # Create EventBridge rule for daily execution at midnight Sydney time
-        self.event_rule = self._create_eventbridge_rule()
+        # Create EventBridge Scheduler schedule for daily execution at midnight Sydney time
+        self.schedule = self._create_schedule()
         
         # Create CloudWatch alarms for monitoring
-        self.alarms = self._create_cloudwatch_alarms()
+        self.alarms = self._create_cloudwatch_alarms(enable_alarm_notifications)
     
     def _validate_custom_name(self, custom_name: str) -> str:
         """
@@ -158,33 +220,26 @@ class QuipSyncStack(Stack):
         if len(custom_name) < 3 or len(custom_name) > max_custom_name_length:
             raise ValueError(f"custom_name must be between 3 and {max_custom_name_length} characters long")
         
-        # Check for valid characters (lowercase letters, numbers, hyphens only)
-        if not re.match(r'^[a-z0-9-]+$', custom_name):
-            raise ValueError("custom_name can only contain lowercase letters, numbers, and hyphens")
-        
-        # Must start and end with letter or number
-        if not re.match(r'^[a-z0-9].*[a-z0-9]$', custom_name):
-            raise ValueError("custom_name must start and end with a letter or number")
-        
-        # Cannot contain consecutive hyphens
-        if '--' in custom_name:
-            raise ValueError("custom_name cannot contain consecutive hyphens")
+        # Check characters, start/end and consecutive hyphens in one pass
+        if not _CUSTOM_NAME_RE.fullmatch(custom_name):
+            raise ValueError(
+                "custom_name can only contain lowercase letters, numbers, and hyphens, "
+                "must start and end with a letter or number and cannot contain consecutive hyphens"
+            )
         
         # Cannot be formatted as IP address (basic check)
-        ip_pattern = r'^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$'
-        if re.match(ip_pattern, custom_name.replace('-', '.')):
+        if _IP_ADDRESS_RE.fullmatch(custom_name.replace('-', '.')):
             raise ValueError("custom_name cannot be formatted as an IP address")
         
-        # Additional AWS reserved names check
-        reserved_names = ['aws', 'amazon', 'amzn']
-        if any(reserved in custom_name.lower() for reserved in reserved_names):
+        # Additional AWS reserved names check (custom_name is already known to be lowercase)
+        if _RESERVED_WORDS_RE.search(custom_name):
             raise ValueError("custom_name cannot contain AWS reserved words (aws, amazon, amzn)")
         
         return custom_name
         
     def _create_s3_bucket(self) -> s3.Bucket:
         """
-        Create S3 bucket with dynamic name and QuickSight access policy
+        Create S3 bucket with dynamic name
         
         Returns:
             s3.Bucket: The created S3 bucket
@@ -195,18 +250,30 @@ class QuipSyncStack(Stack):
             self, "QuipSyncBucket",
             bucket_name=bucket_name,
             versioned=True,
+            # SSE-S3 avoids per-object KMS calls; the bucket key keeps KMS request volume low
+            # should the bucket ever move to SSE-KMS
             encryption=s3.BucketEncryption.S3_MANAGED,
-            public_read_access=False,
-            block_public_access=s3.BlockPublicAccess.BLOCK_ALL
+            bucket_key_enabled=True,
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            lifecycle_rules=[
+                # Let S3 tier rarely-read exports, keep only a month of superseded versions
+                # and clean up multipart uploads left behind by interrupted runs
+                s3.LifecycleRule(
+                    id="QuipSyncStorageLifecycle",
+                    enabled=True,
+                    transitions=[
+                        s3.Transition(
+                            storage_class=s3.StorageClass.INTELLIGENT_TIERING,
+                            transition_after=Duration.days(0)
+                        )
+                    ],
+                    noncurrent_version_expiration=Duration.days(30),
+                    abort_incomplete_multipart_upload_after=Duration.days(1)
+                )
+            ]
         )
         
-        # Create bucket policy for QuickSight access if parameters are provided
-        self._create_bucket_policy(bucket)
-        
-        # Add tags for resource identification and security
-        Tags.of(bucket).add("Purpose", "QuipSync")
-        Tags.of(bucket).add("Application", "QuipS3Sync")
-        Tags.of(bucket).add("Environment", "Production")
+        # Tag the bucket with its data classification
         Tags.of(bucket).add("DataClassification", "Internal")
         
         return bucket
@@ -218,8 +285,8 @@ class QuipSyncStack(Stack):
         Args:
             bucket: The S3 bucket to apply the policy to
         """
-        # Only create bucket policy if QuickSight parameters are provided
-        # Use CDK conditions to handle optional parameters
+        bucket_arn = bucket.bucket_arn
+        
         bucket_policy = s3.BucketPolicy(
             self, "QuipSyncBucketPolicy",
             bucket=bucket,
@@ -239,8 +306,8 @@ class QuipSyncStack(Stack):
                             "s3:ListBucketVersions"
                         ],
                         resources=[
-                            bucket.bucket_arn,
-                            f"{bucket.bucket_arn}/*"
+                            bucket_arn,
+                            f"{bucket_arn}/*"
                         ],
                         conditions={
                             "StringEquals": {
@@ -253,22 +320,14 @@ class QuipSyncStack(Stack):
             )
         )
         
-        # Add conditional creation - only create policy if service role ARN is provided
-        # Create condition to check if service role ARN is provided
+        # Only create the policy if a service role ARN is provided when the stack is deployed
         has_service_role = CfnCondition(
             self, "HasServiceRole",
             expression=Fn.condition_not(
                 Fn.condition_equals(self.service_role_param.value_as_string, "")
             )
         )
-        
-        # Apply condition to bucket policy
         bucket_policy.node.default_child.cfn_options.condition = has_service_role
-        
-        # Add tags for resource identification
-        Tags.of(bucket_policy).add("Purpose", "QuipSync")
-        Tags.of(bucket_policy).add("Application", "QuipS3Sync")
-        Tags.of(bucket_policy).add("Environment", "Production")
     
     def _create_secrets_manager_secret(self) -> secretsmanager.Secret:
         """
@@ -279,360 +338,364 @@ class QuipSyncStack(Stack):
         """
         secret_name = f"quip-sync-{self.custom_name}-credentials"
         
-        # Build the secret string from parameters
-        secret_dict = {
-            "quip_access_token": self.quip_access_token_param.value_as_string,
-            "folder_ids": self.quip_folder_ids_param.value_as_string
-        }
-        secret_string = json.dumps(secret_dict)
-        
+        # The JSON secret is assembled by CloudFormation from the no-echo parameter
         secret = secretsmanager.Secret(
             self, "QuipCredentials",
             secret_name=secret_name,
-            description=f"Quip access token and folder IDs for synchronization ({self.custom_name})",
-            secret_string_value=SecretValue.unsafe_plain_text(secret_string)
+            description=f"Quip access token for synchronization ({self.custom_name})",
+            secret_object_value={
+                "quip_access_token": SecretValue.cfn_parameter(self.quip_access_token_param)
+            }
         )
         
-        # Add tags for IAM policy conditions and resource identification
-        Tags.of(secret).add("Purpose", "QuipSync")
-        Tags.of(secret).add("Application", "QuipS3Sync")
-        Tags.of(secret).add("Environment", "Production")
-        
         return secret
     
-    def _create_lambda_function(self) -> _lambda.Function:
+    def _create_folder_ids_parameter(self) -> ssm.StringParameter:
+        """
+        Create SSM String parameter for the Quip folder IDs
+        
+        Folder IDs are not sensitive, so they live in a Standard parameter rather than
+        the secret and are read without a KMS decrypt.
+        
+        Returns:
+            ssm.StringParameter: The created parameter
+        """
+        # SSM rejects empty values, so store a placeholder until deploy.py writes the real IDs;
+        # the function reports the placeholder as a ConfigurationError (see SecretsClient)
+        has_folder_ids = CfnCondition(
+            self, "HasFolderIds",
+            expression=Fn.condition_not(
+                Fn.condition_equals(self.quip_folder_ids_param.value_as_string, "")
+            )
+        )
+        
+        parameter = ssm.StringParameter(
+            self, "QuipFolderIds",
+            parameter_name=f"/quip-sync/{self.custom_name}/folder-ids",
+            description=f"Comma-separated Quip folder IDs to synchronize ({self.custom_name})",
+            string_value=Fn.condition_if(
+                has_folder_ids.logical_id,
+                self.quip_folder_ids_param.value_as_string,
+                "-"
+            ).to_string()
+        )
+        
+        return parameter
+    
+    def _create_vpc_endpoints(self, vpc_id: str, create_s3_endpoint: bool = True) -> ec2.IVpc:
+        """
+        Look up the Lambda function's VPC and add an S3 gateway endpoint to it
+        
+        Document uploads are the bulk of the function's traffic, so they must not be
+        routed through a NAT gateway.
+        
+        Args:
+            vpc_id: ID of the existing VPC
+            create_s3_endpoint: Add the S3 gateway endpoint (skip if the VPC already has one)
+            
+        Returns:
+            ec2.IVpc: The VPC
+        """
+        vpc = ec2.Vpc.from_lookup(self, "QuipSyncVpc", vpc_id=vpc_id)
+        if create_s3_endpoint:
+            vpc.add_gateway_endpoint(
+                "QuipSyncS3Endpoint",
+                service=ec2.GatewayVpcEndpointAwsService.S3
+            )
+        
+        return vpc
+    
+    def _create_lambda_function(
+        self,
+        lambda_code_bucket: Optional[s3.IBucket] = None,
+        lambda_code_version: Optional[str] = None
+    ) -> _lambda.Function:
         """
         Create Lambda function with Python 3.13 runtime and specified configuration
         
+        Args:
+            lambda_code_bucket: Bucket holding quip-sync-lambda.zip; looked up by name if not given
+            lambda_code_version: S3 object version of quip-sync-lambda.zip to deploy
+        
         Returns:
             _lambda.Function: The created Lambda function
         """
+        function_name = f"quip-sync-{self.custom_name}-function"
+        
+        # Lambda code is stored in S3 bucket: <account-id>-quip-s3-sync-lambda
+        if lambda_code_bucket is None:
+            lambda_code_bucket = s3.Bucket.from_bucket_name(
+                self, "LambdaCodeBucket",
+                bucket_name=f"{self.account}-quip-s3-sync-lambda"
+            )
+        
+        # Create CloudWatch log group
+        log_group = logs.LogGroup(
+            self, "QuipSyncLogGroup",
+            log_group_name=f"/aws/lambda/{function_name}",
+            retention=logs.RetentionDays.ONE_MONTH
+        )
+        
         # Create Lambda execution role with least-privilege permissions
         # This role implements the principle of least privilege by:
-        # 1. Granting access only to the specific Secrets Manager secret containing Quip credentials
-        # 2. Limiting S3 permissions to the designated sync bucket only
-        # 3. Restricting CloudWatch Logs access to the Lambda function's log group
-        # 4. Using separate policy documents for different service permissions for better auditability
+        # 1. Granting read access only to the Secrets Manager secret containing the Quip token
+        # 2. Granting read access only to the folder IDs SSM parameter
+        # 3. Limiting S3 permissions to reading and writing objects in the designated sync bucket
+        # 4. Restricting CloudWatch Logs access to the Lambda function's log streams
         lambda_role = iam.Role(
             self, "QuipSyncLambdaRole",
             role_name=f"quip-sync-{self.custom_name}-lambda-execution-role",
             description=f"Execution role for Quip-S3 synchronization Lambda function ({self.custom_name})",
             assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
             inline_policies={
-                "QuipSyncSecretsManagerPolicy": iam.PolicyDocument(
-                    statements=[
-                        # Secrets Manager permissions - least privilege access to specific secret
-                        iam.PolicyStatement(
-                            sid="AllowGetQuipCredentials",
-                            effect=iam.Effect.ALLOW,
-                            actions=["secretsmanager:GetSecretValue"],
-                            resources=[self.secret.secret_arn]
-                        )
-                    ]
-                ),
-                "QuipSyncS3Policy": iam.PolicyDocument(
-                    statements=[
-                        # S3 permissions - least privilege access to specific bucket
-                        iam.PolicyStatement(
-                            sid="AllowS3BucketOperations",
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "s3:ListBucket",
-                                "s3:GetBucketLocation"
-                            ],
-                            resources=[self.bucket.bucket_arn]
-                        ),
-                        iam.PolicyStatement(
-                            sid="AllowS3ObjectOperations", 
-                            effect=iam.Effect.ALLOW,
-                            actions=[
-                                "s3:GetObject",
-                                "s3:PutObject",
-                                "s3:PutObjectMetadata",
-                                "s3:PutObjectTagging"
-                            ],
-                            resources=[f"{self.bucket.bucket_arn}/*"]
-                        )
-                    ]
-                ),
-                "QuipSyncLambdaCodeS3Policy": iam.PolicyDocument(
+                "QuipSyncLambdaPolicy": iam.PolicyDocument(
                     statements=[
                         # S3 permissions for Lambda code bucket - read-only access
                         iam.PolicyStatement(
                             sid="AllowGetLambdaCode",
                             effect=iam.Effect.ALLOW,
                             actions=["s3:GetObject"],
-                            resources=[f"arn:aws:s3:::{self.account}-quip-s3-sync-lambda/quip-sync-lambda.zip"]
-                        )
-                    ]
-                ),
-                "QuipSyncCloudWatchLogsPolicy": iam.PolicyDocument(
-                    statements=[
-                        # CloudWatch Logs permissions - scoped to specific log group
+                            resources=[lambda_code_bucket.arn_for_objects("quip-sync-lambda.zip")]
+                        ),
+                        # CloudWatch Logs permissions - the log group is created by the stack,
+                        # so the function only needs to write its own streams
                         iam.PolicyStatement(
                             sid="AllowCloudWatchLogsOperations",
                             effect=iam.Effect.ALLOW,
                             actions=[
-                                "logs:CreateLogGroup",
-                                "logs:CreateLogStream", 
-                                "logs:PutLogEvents",
-                                "logs:DescribeLogGroups",
-                                "logs:DescribeLogStreams"
+                                "logs:CreateLogStream",
+                                "logs:PutLogEvents"
                             ],
-                            resources=[
-                                f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws/lambda/quip-sync-{self.custom_name}-function",
-                                f"arn:aws:logs:{self.region}:{self.account}:log-group:/aws/lambda/quip-sync-{self.custom_name}-function:*"
-                            ]
+                            # The log group ARN ends in ":*", which covers its log streams
+                            resources=[log_group.log_group_arn]
                         )
                     ]
                 )
             }
         )
         
-        # Create CloudWatch log group
-        log_group = logs.LogGroup(
-            self, "QuipSyncLogGroup",
-            log_group_name=f"/aws/lambda/quip-sync-{self.custom_name}-function",
-            retention=logs.RetentionDays.ONE_MONTH
-        )
+        # Service permissions come from CDK grants, which emit the correct actions for each resource
+        self.secret.grant_read(lambda_role)
+        self.folder_ids_parameter.grant_read(lambda_role)
+        self.bucket.grant_read(lambda_role)
+        self.bucket.grant_put(lambda_role)
         
-        # Create Lambda function
-        # Lambda code is stored in S3 bucket: <account-id>-quip-s3-sync-lambda
-        lambda_code_bucket_name = f"{self.account}-quip-s3-sync-lambda"
+        # CDK only adds the ENI permissions itself when it creates the role, so attach them here
+        if self.vpc:
+            lambda_role.add_managed_policy(
+                iam.ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaVPCAccessExecutionRole")
+            )
         
+        # Create Lambda function
         lambda_function = _lambda.Function(
             self, "QuipSyncFunction",
-            function_name=f"quip-sync-{self.custom_name}-function",
+            function_name=function_name,
             runtime=_lambda.Runtime.PYTHON_3_13,
+            architecture=_lambda.Architecture.ARM_64,
             handler="lambda_function.lambda_handler",
+            # current_version is hashed from the synthesized template, so a new upload under the
+            # same key only publishes a new version when its object version is passed in
             code=_lambda.Code.from_bucket(
-                bucket=s3.Bucket.from_bucket_name(
-                    self, "LambdaCodeBucket",
-                    bucket_name=lambda_code_bucket_name
-                ),
-                key="quip-sync-lambda.zip"
+                bucket=lambda_code_bucket,
+                key="quip-sync-lambda.zip",
+                object_version=lambda_code_version
             ),
-            memory_size=1024,
+            memory_size=self.lambda_memory_mb,
             timeout=Duration.minutes(15),
+            # The daily run is always a cold start; resume from an initialized snapshot instead
+            snap_start=_lambda.SnapStartConf.ON_PUBLISHED_VERSIONS,
             role=lambda_role,
+            # The function only joins a VPC together with the S3 gateway endpoint
+            vpc=self.vpc,
+            vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS) if self.vpc else None,
             environment={
                 "S3_BUCKET_NAME": self.bucket.bucket_name,
                 "SECRET_NAME": self.secret.secret_name,
-                "LOG_LEVEL": "INFO"
+                "FOLDER_IDS_PARAMETER_NAME": self.folder_ids_parameter.parameter_name,
+                "LOG_LEVEL": "INFO",
+                "QUIP_MAX_WORKERS": str(self.quip_max_workers),
+                # The package ships without .pyc files and /var/task is read-only, so skip the
+                # failed bytecode writes on import; clients are built at module scope (INIT phase)
+                "PYTHONDONTWRITEBYTECODE": "1",
+                # Powertools Metrics emits all custom metrics as one EMF log line per invocation
+                "POWERTOOLS_METRICS_NAMESPACE": METRICS_NAMESPACE,
+                "POWERTOOLS_SERVICE_NAME": self.service_name
             },
-            log_group=log_group
+            log_group=log_group,
+            # Serve the secret from an in-process cache instead of calling Secrets Manager
+            params_and_secrets=_lambda.ParamsAndSecretsLayerVersion.from_version(
+                _lambda.ParamsAndSecretsVersions.V1_0_103,
+                cache_size=10,
+                http_port=2773,
+                secrets_manager_ttl=Duration.minutes(5)
+            )
         )
         
-        # Add tags for resource identification and security
-        Tags.of(lambda_function).add("Purpose", "QuipSync")
-        Tags.of(lambda_function).add("Application", "QuipS3Sync")
-        Tags.of(lambda_function).add("Environment", "Production")
-        Tags.of(lambda_role).add("Purpose", "QuipSync")
-        Tags.of(lambda_role).add("Application", "QuipS3Sync")
-        Tags.of(lambda_role).add("Environment", "Production")
+        # SnapStart only applies to published versions, so invoke through an alias
+        self.lambda_alias = _lambda.Alias(
+            self, "QuipSyncFunctionLiveAlias",
+            alias_name="live",
+            version=lambda_function.current_version
+        )
         
         return lambda_function
     
-    def _create_eventbridge_rule(self) -> events.Rule:
+    def _create_schedule(self) -> scheduler.CfnSchedule:
         """
-        Create EventBridge rule for daily execution at midnight Sydney time
+        Create EventBridge Scheduler schedule for daily execution at midnight Sydney time
         
         Returns:
-            events.Rule: The created EventBridge rule
+            scheduler.CfnSchedule: The created schedule
         """
-        # Cron expression for midnight Sydney time (UTC+10/UTC+11)
-        # Using 0 14 * * ? * (2 PM UTC = midnight Sydney time during standard time)
-        # Note: This doesn't account for daylight saving time transitions
-        event_rule = events.Rule(
-            self, "QuipSyncSchedule",
-            rule_name=f"quip-sync-{self.custom_name}-daily-schedule",
-            description=f"Daily trigger for Quip-S3 synchronization at midnight Sydney time ({self.custom_name})",
-            schedule=events.Schedule.cron(
-                minute="0",
-                hour="14",  # 2 PM UTC = midnight Sydney time (UTC+10)
-                day="*",
-                month="*",
-                year="*"
-            ),
-            enabled=True
+        # EventBridge Scheduler invokes the target with its own role rather than a
+        # resource-based permission on the function
+        scheduler_role = iam.Role(
+            self, "QuipSyncSchedulerRole",
+            description=f"Role used by EventBridge Scheduler to invoke the Quip sync function ({self.custom_name})",
+            assumed_by=iam.ServicePrincipal("scheduler.amazonaws.com")
         )
+        self.lambda_alias.grant_invoke(scheduler_role)
         
-        # Add Lambda function as target
-        event_rule.add_target(
-            targets.LambdaFunction(
-                self.lambda_function,
-                retry_attempts=2,
-                max_event_age=Duration.hours(2)
+        # The schedule is evaluated in Sydney time, so AEST/AEDT transitions are handled natively
+        schedule = scheduler.CfnSchedule(
+            self, "QuipSyncSchedule",
+            name=f"quip-sync-{self.custom_name}-daily-schedule",
+            description=f"Daily trigger for Quip-S3 synchronization at midnight Sydney time ({self.custom_name})",
+            schedule_expression="cron(0 0 * * ? *)",
+            schedule_expression_timezone="Australia/Sydney",
+            flexible_time_window=scheduler.CfnSchedule.FlexibleTimeWindowProperty(mode="OFF"),
+            state="ENABLED",
+            target=scheduler.CfnSchedule.TargetProperty(
+                arn=self.lambda_alias.function_arn,
+                role_arn=scheduler_role.role_arn,
+                retry_policy=scheduler.CfnSchedule.RetryPolicyProperty(
+                    maximum_retry_attempts=2,
+                    maximum_event_age_in_seconds=int(Duration.hours(2).to_seconds())
+                )
             )
         )
         
-        # Grant EventBridge permission to invoke Lambda
-        self.lambda_function.add_permission(
-            "AllowEventBridgeInvoke",
-            principal=iam.ServicePrincipal("events.amazonaws.com"),
-            source_arn=event_rule.rule_arn
-        )
+        return schedule
+    
+    def _custom_metric(self, metric_name: str, period: Duration, statistic: str = "Sum") -> cloudwatch.Metric:
+        """
+        Build a custom application metric emitted by the sync Lambda function via EMF
         
-        return event_rule
+        Args:
+            metric_name: Name of the metric
+            period: Evaluation period
+            statistic: Statistic to evaluate
+            
+        Returns:
+            cloudwatch.Metric: The metric
+        """
+        return cloudwatch.Metric(
+            namespace=METRICS_NAMESPACE,
+            metric_name=metric_name,
+            dimensions_map=self._metric_dimensions,
+            period=period,
+            statistic=statistic
+        )
     
-    def _create_cloudwatch_alarms(self) -> Dict[str, cloudwatch.Alarm]:
+    def _create_cloudwatch_alarms(self, enable_alarm_notifications: bool = False) -> Dict[str, cloudwatch.AlarmBase]:
         """
         Create CloudWatch alarms for Lambda function failures and execution timeouts
         
+        Args:
+            enable_alarm_notifications: Create an SNS topic for the roll-up health alarm
+        
         Returns:
             dict: Dictionary of created CloudWatch alarms
         """
         alarms = {}
         
-        # Create SNS topic for alarm notifications (optional)
-        alarm_topic = sns.Topic(
-            self, "QuipSyncAlarmTopic",
-            topic_name=f"quip-sync-{self.custom_name}-alarms",
-            display_name=f"Quip S3 Sync Alarms ({self.custom_name})"
-        )
-        
-        # Lambda function error alarm
-        alarms['lambda_errors'] = cloudwatch.Alarm(
-            self, "QuipSyncLambdaErrorAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-lambda-errors",
-            alarm_description=f"Alert when Quip S3 sync Lambda function encounters errors ({self.custom_name})",
-            metric=self.lambda_function.metric_errors(
-                period=Duration.minutes(5),
-                statistic="Sum"
-            ),
-            threshold=1,
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
-        
-        # Lambda function timeout alarm
-        alarms['lambda_duration'] = cloudwatch.Alarm(
-            self, "QuipSyncLambdaDurationAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-lambda-duration",
-            alarm_description=f"Alert when Quip S3 sync Lambda function approaches timeout ({self.custom_name})",
-            metric=self.lambda_function.metric_duration(
-                period=Duration.minutes(5),
-                statistic="Maximum"
-            ),
-            threshold=Duration.minutes(13).to_milliseconds(),  # Alert at 13 minutes (2 min before 15 min timeout)
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
-        
-        # Lambda function throttle alarm
-        alarms['lambda_throttles'] = cloudwatch.Alarm(
-            self, "QuipSyncLambdaThrottleAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-lambda-throttles",
-            alarm_description=f"Alert when Quip S3 sync Lambda function is throttled ({self.custom_name})",
-            metric=self.lambda_function.metric_throttles(
-                period=Duration.minutes(5),
-                statistic="Sum"
+        five_minutes = Duration.minutes(5)
+        at_or_above = cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD
+        
+        # (key, construct id, name suffix, description, metric, threshold, evaluation periods, comparison)
+        alarm_specs = [
+            # Lambda health: errors, throttles and near-timeout durations share a 5 minute period,
+            # so one metric math expression covers all three. Alert at 13 minutes duration
+            # (2 min before 15 min timeout)
+            (
+                'lambda_health', "QuipSyncLambdaHealthAlarm", "lambda-health",
+                "Alert when Quip S3 sync Lambda function errors, is throttled or approaches timeout",
+                cloudwatch.MathExpression(
+                    expression=f"IF(errors + throttles >= 1 || duration >= {Duration.minutes(13).to_milliseconds()}, 1, 0)",
+                    using_metrics={
+                        "errors": self.lambda_function.metric_errors(statistic="Sum"),
+                        "throttles": self.lambda_function.metric_throttles(statistic="Sum"),
+                        "duration": self.lambda_function.metric_duration(statistic="Maximum")
+                    },
+                    label="LambdaUnhealthy",
+                    period=five_minutes
+                ),
+                1, 1, at_or_above
             ),
-            threshold=1,
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
-        
-        # Custom metric alarms for application-specific metrics
-        
-        # Quip API error rate alarm
-        alarms['quip_api_errors'] = cloudwatch.Alarm(
-            self, "QuipSyncQuipAPIErrorAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-quip-api-errors",
-            alarm_description=f"Alert when Quip API error rate is high ({self.custom_name})",
-            metric=cloudwatch.Metric(
-                namespace="AWS/Lambda",
-                metric_name="QuipAPIErrors",
-                dimensions_map={
-                    "FunctionName": self.lambda_function.function_name
-                },
-                period=Duration.minutes(5),
-                statistic="Sum"
+            # Application errors: more than 5 Quip API errors or 3 S3 upload errors in 5 minutes
+            (
+                'application_errors', "QuipSyncApplicationErrorAlarm", "application-errors",
+                "Alert when Quip API or S3 upload error rate is high",
+                cloudwatch.MathExpression(
+                    expression="IF(quipApiErrors >= 5 || s3UploadErrors >= 3, 1, 0)",
+                    using_metrics={
+                        "quipApiErrors": self._custom_metric("QuipAPIErrors", period=five_minutes),
+                        "s3UploadErrors": self._custom_metric("S3UploadErrors", period=five_minutes)
+                    },
+                    label="ApplicationErrors",
+                    period=five_minutes
+                ),
+                1, 1, at_or_above
             ),
-            threshold=5,  # Alert if more than 5 Quip API errors in 5 minutes
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
-        
-        # S3 upload failure alarm
-        alarms['s3_upload_errors'] = cloudwatch.Alarm(
-            self, "QuipSyncS3UploadErrorAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-s3-upload-errors",
-            alarm_description=f"Alert when S3 upload error rate is high ({self.custom_name})",
-            metric=cloudwatch.Metric(
-                namespace="AWS/Lambda",
-                metric_name="S3UploadErrors",
-                dimensions_map={
-                    "FunctionName": self.lambda_function.function_name
-                },
-                period=Duration.minutes(5),
-                statistic="Sum"
+            # Sync success rate below 90%
+            (
+                'sync_success_rate', "QuipSyncSuccessRateAlarm", "success-rate-low",
+                "Alert when sync success rate drops below 90%",
+                self._custom_metric("SyncSuccessRate", statistic="Average", period=Duration.minutes(15)),
+                90, 1, cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD
             ),
-            threshold=3,  # Alert if more than 3 S3 upload errors in 5 minutes
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
-        
-        # Sync success rate alarm (alert if success rate drops below 90%)
-        alarms['sync_success_rate'] = cloudwatch.Alarm(
-            self, "QuipSyncSuccessRateAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-success-rate-low",
-            alarm_description=f"Alert when sync success rate drops below 90% ({self.custom_name})",
-            metric=cloudwatch.Metric(
-                namespace="AWS/Lambda",
-                metric_name="SyncSuccessRate",
-                dimensions_map={
-                    "FunctionName": self.lambda_function.function_name
-                },
-                period=Duration.minutes(15),
-                statistic="Average"
+            # Average Quip API latency above 10 seconds
+            (
+                'high_api_latency', "QuipSyncHighAPILatencyAlarm", "high-api-latency",
+                "Alert when average Quip API latency is high",
+                self._custom_metric("AvgQuipAPILatency", statistic="Average", period=Duration.minutes(10)),
+                10, 2, at_or_above
             ),
-            threshold=90,
-            evaluation_periods=1,
-            comparison_operator=cloudwatch.ComparisonOperator.LESS_THAN_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
-        )
+        ]
+        
+        for key, construct_id, suffix, description, metric, threshold, evaluation_periods, comparison_operator in alarm_specs:
+            alarms[key] = cloudwatch.Alarm(
+                self, construct_id,
+                alarm_name=f"quip-sync-{self.custom_name}-{suffix}",
+                alarm_description=f"{description} ({self.custom_name})",
+                metric=metric,
+                threshold=threshold,
+                evaluation_periods=evaluation_periods,
+                comparison_operator=comparison_operator,
+                treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
+            )
         
-        # High API latency alarm
-        alarms['high_api_latency'] = cloudwatch.Alarm(
-            self, "QuipSyncHighAPILatencyAlarm",
-            alarm_name=f"quip-sync-{self.custom_name}-high-api-latency",
-            alarm_description=f"Alert when average Quip API latency is high ({self.custom_name})",
-            metric=cloudwatch.Metric(
-                namespace="AWS/Lambda",
-                metric_name="AvgQuipAPILatency",
-                dimensions_map={
-                    "FunctionName": self.lambda_function.function_name
-                },
-                period=Duration.minutes(10),
-                statistic="Average"
-            ),
-            threshold=10,  # Alert if average API latency exceeds 10 seconds
-            evaluation_periods=2,
-            comparison_operator=cloudwatch.ComparisonOperator.GREATER_THAN_OR_EQUAL_TO_THRESHOLD,
-            treat_missing_data=cloudwatch.TreatMissingData.NOT_BREACHING
+        # Single roll-up alarm so notifications only need to be wired up once
+        alarms['health'] = cloudwatch.CompositeAlarm(
+            self, "QuipSyncHealth",
+            composite_alarm_name=f"quip-sync-{self.custom_name}-health",
+            alarm_description=f"Alert when any Quip S3 sync alarm is in ALARM state ({self.custom_name})",
+            alarm_rule=cloudwatch.AlarmRule.any_of(*alarms.values())
         )
         
-        # Add SNS topic subscription for notifications (commented out - can be enabled as needed)
-        # for alarm_name, alarm in alarms.items():
-        #     alarm.add_alarm_action(
-        #         cloudwatch_actions.SnsAction(alarm_topic)
-        #     )
+        # Create SNS topic for alarm notifications only when something will publish to it
+        if enable_alarm_notifications:
+            alarm_topic = sns.Topic(
+                self, "QuipSyncAlarmTopic",
+                topic_name=f"quip-sync-{self.custom_name}-alarms",
+                display_name=f"Quip S3 Sync Alarms ({self.custom_name})"
+            )
+            alarms['health'].add_alarm_action(
+                cloudwatch_actions.SnsAction(alarm_topic)
+            )
         
-        # Add tags to alarms
+        # Tag each alarm with its type
         for alarm_name, alarm in alarms.items():
-            Tags.of(alarm).add("Purpose", "QuipSync")
-            Tags.of(alarm).add("Application", "QuipS3Sync")
-            Tags.of(alarm).add("Environment", "Production")
             Tags.of(alarm).add("AlarmType", alarm_name)
         
-        Tags.of(alarm_topic).add("Purpose", "QuipSync")
-        Tags.of(alarm_topic).add("Application", "QuipS3Sync")
-        Tags.of(alarm_topic).add("Environment", "Production")
-        
         return alarms
\ No newline at end of file
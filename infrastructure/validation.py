@@ -0,0 +1,40 @@
+"""
+Validation helpers for the Quip-S3 synchronization CDK app
+"""
+
+import re
+
+
+# CloudFormation stack naming rules in a single pattern:
+# - Letters, numbers, and hyphens only
+# - Must start with letter
+# - Cannot end with hyphen
+_STACK_NAME_RE = re.compile(r'[A-Za-z](?:[A-Za-z0-9-]*[A-Za-z0-9])?')
+
+
+def validate_stack_name(name: str) -> str:
+    """
+    Validate CloudFormation stack name follows AWS naming conventions
+    
+    Args:
+        name: The stack name to validate
+        
+    Returns:
+        str: The validated stack name
+        
+    Raises:
+        ValueError: If stack name doesn't meet CloudFormation requirements
+    """
+    if not name:
+        raise ValueError("Stack name cannot be empty")
+    
+    if len(name) > 128:
+        raise ValueError("Stack name must be between 1 and 128 characters long")
+    
+    if not _STACK_NAME_RE.fullmatch(name):
+        raise ValueError(
+            "Stack name can only contain letters, numbers, and hyphens, "
+            "must start with a letter and cannot end with a hyphen"
+        )
+    
+    return name
@@ -20,6 +20,9 @@ Environment Variables:
     
     # Logging (optional)
     LOG_LEVEL=DEBUG
+    
+    # Concurrent Quip API requests (optional, default 8)
+    QUIP_MAX_WORKERS=8
 
 Example:
     export QUIP_ACCESS_TOKEN="Bearer abcd1234efgh5678"
@@ -33,14 +36,12 @@ Example:
 import os
 import sys
 import json
-import logging
-from typing import Dict, Any
+import time
 
 # Add src directory to Python path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-# Import the lambda function
-from lambda_function import lambda_handler
+SRC_DIR = os.path.join(os.path.dirname(__file__), 'src')
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
 
 
 class MockLambdaContext:
@@ -52,55 +53,65 @@ class MockLambdaContext:
         self.function_version = "$LATEST"
         self.invoked_function_arn = "arn:aws:lambda:local:123456789012:function:quip-sync-function-local"
         self.memory_limit_in_mb = "1024"
-        self.remaining_time_in_millis = 900000  # 15 minutes
+        self._deadline_ns = time.monotonic_ns() + 900000 * 1000000  # 15 minutes
         self.log_group_name = "/aws/lambda/quip-sync-function-local"
         self.log_stream_name = "2024/01/01/[$LATEST]local"
         self.aws_request_id = "local-test-request-id"
         
     def get_remaining_time_in_millis(self):
-        return self.remaining_time_in_millis
+        return max(0, (self._deadline_ns - time.monotonic_ns()) // 1000000)
 
 
-def setup_environment():
+def setup_environment(env):
     """
     Set up environment variables with defaults for local development
+    
+    Args:
+        env: Environment mapping to update in place
     """
     # Set default AWS region if not specified
-    if not os.environ.get('AWS_REGION'):
-        os.environ['AWS_REGION'] = 'us-east-1'
+    if not env.get('AWS_REGION'):
+        env['AWS_REGION'] = 'us-east-1'
     
     # Set default S3 bucket name if not specified
-    if not os.environ.get('S3_BUCKET_NAME'):
+    if not env.get('S3_BUCKET_NAME'):
         # Try to construct from AWS account ID if available
-        account_id = os.environ.get('AWS_ACCOUNT_ID')
+        account_id = env.get('AWS_ACCOUNT_ID')
         if account_id:
-            os.environ['S3_BUCKET_NAME'] = f"{account_id}-quip-sync"
+            env['S3_BUCKET_NAME'] = f"{account_id}-quip-sync"
         else:
             # Use a placeholder - user will need to set this
-            os.environ['S3_BUCKET_NAME'] = "your-account-id-quip-sync"
+            env['S3_BUCKET_NAME'] = "your-account-id-quip-sync"
     
     # Set default secret name if not specified
-    if not os.environ.get('SECRET_NAME'):
-        os.environ['SECRET_NAME'] = 'quip-sync-credentials'
+    if not env.get('SECRET_NAME'):
+        env['SECRET_NAME'] = 'quip-sync-credentials'
     
     # Set default log level if not specified
-    if not os.environ.get('LOG_LEVEL'):
-        os.environ['LOG_LEVEL'] = 'INFO'
+    if not env.get('LOG_LEVEL'):
+        env['LOG_LEVEL'] = 'INFO'
+    
+    # Metrics are flushed as EMF at the end of the handler and need a namespace
+    if not env.get('POWERTOOLS_METRICS_NAMESPACE'):
+        env['POWERTOOLS_METRICS_NAMESPACE'] = 'QuipSync'
 
 
-def validate_environment():
+def validate_environment(env):
     """
     Validate that required environment variables are set
+    
+    Args:
+        env: Environment mapping to check
     """
     required_vars = []
     
     # Check if we have Quip credentials via environment variables
-    if not (os.environ.get('QUIP_ACCESS_TOKEN') and os.environ.get('QUIP_FOLDER_IDS')):
+    if not (env.get('QUIP_ACCESS_TOKEN') and env.get('QUIP_FOLDER_IDS')):
         # If not using env vars, we need AWS credentials and secret name
-        if not os.environ.get('SECRET_NAME'):
+        if not env.get('SECRET_NAME'):
             required_vars.append('SECRET_NAME (or QUIP_ACCESS_TOKEN + QUIP_FOLDER_IDS)')
     
-    if not os.environ.get('S3_BUCKET_NAME'):
+    if not env.get('S3_BUCKET_NAME'):
         required_vars.append('S3_BUCKET_NAME')
     
     if required_vars:
@@ -114,23 +125,29 @@ def validate_environment():
     return True
 
 
-def print_configuration():
+def print_configuration(env):
     """
     Print the current configuration for debugging
+    
+    Args:
+        env: Environment mapping to report on
     """
-    print("🔧 Configuration:")
-    print(f"   AWS Region: {os.environ.get('AWS_REGION', 'Not set')}")
-    print(f"   S3 Bucket: {os.environ.get('S3_BUCKET_NAME', 'Not set')}")
-    print(f"   Secret Name: {os.environ.get('SECRET_NAME', 'Not set')}")
-    print(f"   Log Level: {os.environ.get('LOG_LEVEL', 'Not set')}")
+    lines = [
+        "🔧 Configuration:",
+        f"   AWS Region: {env.get('AWS_REGION', 'Not set')}",
+        f"   S3 Bucket: {env.get('S3_BUCKET_NAME', 'Not set')}",
+        f"   Secret Name: {env.get('SECRET_NAME', 'Not set')}",
+        f"   Log Level: {env.get('LOG_LEVEL', 'Not set')}",
+    ]
     
     # Show credential source
-    if os.environ.get('QUIP_ACCESS_TOKEN') and os.environ.get('QUIP_FOLDER_IDS'):
-        folder_count = len([f.strip() for f in os.environ.get('QUIP_FOLDER_IDS', '').split(',') if f.strip()])
-        print(f"   Quip Credentials: Environment variables ({folder_count} folders)")
+    if env.get('QUIP_ACCESS_TOKEN') and env.get('QUIP_FOLDER_IDS'):
+        folder_count = sum(1 for f in env['QUIP_FOLDER_IDS'].split(',') if f.strip())
+        lines.append(f"   Quip Credentials: Environment variables ({folder_count} folders)")
     else:
-        print(f"   Quip Credentials: AWS Secrets Manager")
-    print()
+        lines.append("   Quip Credentials: AWS Secrets Manager")
+    
+    print("\n".join(lines) + "\n")
 
 
 def main():
@@ -141,14 +158,18 @@ def main():
     print("=" * 50)
     
     # Set up environment
-    setup_environment()
+    env = os.environ
+    setup_environment(env)
     
     # Validate configuration
-    if not validate_environment():
+    if not validate_environment(env):
         sys.exit(1)
     
     # Print configuration
-    print_configuration()
+    print_configuration(env)
+    
+    # Import the lambda function only now: it reads its configuration at import time
+    from lambda_function import lambda_handler
     
     # Create mock context
     context = MockLambdaContext()
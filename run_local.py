@@ -13,14 +13,56 @@ Or run directly with environment variables:
     python local_runner.py
 """
 
+import functools
 import os
+import re
 import sys
-import subprocess
 
+_QUOTED_VALUE_RE = re.compile(rb'([\'"])(.*)\1\Z', re.S)
 
-def load_env_file(env_file='.env'):
+
+@functools.lru_cache(maxsize=4)
+def _parse_env_file(env_file, mtime_ns):
+    """
+    Parse a .env file into a dict, cached on the file's modification time
+    """
+    parsed = {}
+    
+    with open(env_file, 'rb') as f:
+        data = f.read()
+    
+    for line_num, line in enumerate(data.splitlines(), 1):
+        line = line.strip()
+        
+        # Skip empty lines and comments
+        if not line or line[:1] == b'#':
+            continue
+        
+        # Parse KEY=VALUE format
+        key, sep, value = line.partition(b'=')
+        if not sep:
+            print(f"⚠️  Warning: Invalid line {line_num} in {env_file}: {line.decode(errors='replace')}")
+            continue
+        
+        value = value.strip()
+        
+        # Remove quotes if present
+        if value[:1] in (b'"', b"'"):
+            match = _QUOTED_VALUE_RE.match(value)
+            if match:
+                value = match.group(2)
+        
+        parsed[key.strip().decode()] = value.decode()
+    
+    return parsed
+
+
+def load_env_file(env_file='.env', override=False):
     """
     Load environment variables from a .env file
+    
+    Variables already set in the environment win unless override is True,
+    so values exported in the shell are not clobbered by the file.
     """
     if not os.path.exists(env_file):
         print(f"❌ Environment file '{env_file}' not found.")
@@ -31,30 +73,13 @@ def load_env_file(env_file='.env'):
     
     print(f"📁 Loading environment from {env_file}")
     
-    with open(env_file, 'r') as f:
-        for line_num, line in enumerate(f, 1):
-            line = line.strip()
-            
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-            
-            # Parse KEY=VALUE format
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-                
-                # Remove quotes if present
-                if value.startswith('"') and value.endswith('"'):
-                    value = value[1:-1]
-                elif value.startswith("'") and value.endswith("'"):
-                    value = value[1:-1]
-                
-                # Set environment variable
-                os.environ[key] = value
-            else:
-                print(f"⚠️  Warning: Invalid line {line_num} in {env_file}: {line}")
+    parsed = _parse_env_file(env_file, os.stat(env_file).st_mtime_ns)
+    
+    # Set environment variables
+    if override:
+        os.environ.update(parsed)
+    else:
+        os.environ.update({k: v for k, v in parsed.items() if k not in os.environ})
     
     return True
 
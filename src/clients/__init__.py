@@ -1,10 +1,25 @@
 # Client classes for external services
+# Names are resolved lazily on first access so importing the package
+# does not pull in every client module (and boto3) up front
+
+import importlib
+
+_LAZY_IMPORTS = {
+    'SecretsClient': '.secrets_client',
+    'SecretsClientInterface': '.secrets_client',
+    'QuipClient': '.quip_client',
+    'QuipClientInterface': '.quip_client',
+    'S3Client': '.s3_client',
+    'S3ClientInterface': '.s3_client',
+}
+
+__all__ = list(_LAZY_IMPORTS)
 
-# Client classes for external services
-# Import directly from individual modules as needed
 
-__all__ = [
-    'SecretsClient', 'SecretsClientInterface',
-    'QuipClient', 'QuipClientInterface', 
-    'S3Client', 'S3ClientInterface'
-]
\ No newline at end of file
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -5,7 +5,9 @@ Quip API client interface
 import time
 import random
 import logging
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Set, Optional
 from abc import ABC, abstractmethod
 import requests
@@ -21,6 +23,19 @@ from exceptions import QuipAPIError
 logger = Logger(child=True)
 metrics = Metrics()
 
+# Folder children of these types are synced as threads
+_THREAD_TYPES = frozenset({'DOCUMENT', 'SPREADSHEET', 'THREAD'})
+
+# Requests run on worker threads, but the Powertools metric set is shared and not
+# thread-safe (it flushes and clears itself every 100 values), so serialize writes to it
+_metrics_lock = threading.Lock()
+
+
+def _add_metric(name: str, unit: MetricUnit, value: float) -> None:
+    """Record a metric from any thread"""
+    with _metrics_lock:
+        metrics.add_metric(name=name, unit=unit, value=value)
+
 
 class QuipClientInterface(ABC):
     """
@@ -85,19 +100,24 @@ class QuipClient(QuipClientInterface):
     Quip API client implementation with retry logic and recursive folder discovery
     """
     
-    def __init__(self, access_token: str, correlation_id: Optional[str] = None):
+    def __init__(self, access_token: str, correlation_id: Optional[str] = None, max_workers: int = 8):
         """
         Initialize Quip client with access token
         
         Args:
             access_token: Quip personal access token
             correlation_id: Request correlation ID for tracing
+            max_workers: Maximum number of concurrent Quip API requests
         """
         self.access_token = access_token.strip()
         self.base_url = "https://platform.quip-amazon.com"
         self.correlation_id = correlation_id or str(uuid.uuid4())
+        self.max_workers = max(1, max_workers)
         
-        # Configure session with retry strategy
+        # Configure session with retry strategy. The session is shared by the worker threads in
+        # get_threads_metadata and discover_all_threads: concurrent GETs are safe because each
+        # request checks out its own pooled connection, as long as the headers and adapters set
+        # up here are not changed once the client is in use
         self.session = requests.Session()
         
         # Set up retry strategy for transient failures
@@ -108,7 +128,8 @@ class QuipClient(QuipClientInterface):
             allowed_methods=["GET"]
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Size the connection pool to the worker count so concurrent requests reuse warm connections
+        adapter = HTTPAdapter(pool_maxsize=max(10, self.max_workers), max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -173,7 +194,7 @@ class QuipClient(QuipClientInterface):
                             "attempt_duration_seconds": round(attempt_duration, 3)
                         })
                         
-                        metrics.add_metric(name="QuipAPIRateLimits", unit=MetricUnit.Count, value=1)
+                        _add_metric(name="QuipAPIRateLimits", unit=MetricUnit.Count, value=1)
                         time.sleep(delay)
                         continue
                     else:
@@ -183,7 +204,7 @@ class QuipClient(QuipClientInterface):
                             "max_retries": max_retries,
                             "total_duration_seconds": round(time.time() - request_start_time, 3)
                         })
-                        metrics.add_metric(name="QuipAPIRateLimitFailures", unit=MetricUnit.Count, value=1)
+                        _add_metric(name="QuipAPIRateLimitFailures", unit=MetricUnit.Count, value=1)
                         raise QuipAPIError(f"Rate limit exceeded after {max_retries} retries")
                 
                 # Check for other HTTP errors
@@ -193,7 +214,7 @@ class QuipClient(QuipClientInterface):
                         "endpoint": endpoint,
                         "status_code": response.status_code
                     })
-                    metrics.add_metric(name="QuipAPIAuthErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIAuthErrors", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError("Authentication failed - invalid access token")
                 elif response.status_code == 403:
                     logger.error("Quip API access forbidden", extra={
@@ -201,7 +222,7 @@ class QuipClient(QuipClientInterface):
                         "endpoint": endpoint,
                         "status_code": response.status_code
                     })
-                    metrics.add_metric(name="QuipAPIPermissionErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIPermissionErrors", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError("Access forbidden - insufficient permissions")
                 elif response.status_code == 404:
                     logger.error("Quip API resource not found", extra={
@@ -209,7 +230,7 @@ class QuipClient(QuipClientInterface):
                         "endpoint": endpoint,
                         "status_code": response.status_code
                     })
-                    metrics.add_metric(name="QuipAPINotFoundErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPINotFoundErrors", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError(f"Resource not found: {endpoint}")
                 elif not response.ok:
                     logger.error("Quip API HTTP error", extra={
@@ -218,7 +239,7 @@ class QuipClient(QuipClientInterface):
                         "status_code": response.status_code,
                         "response_text": response.text[:500]  # Limit response text length
                     })
-                    metrics.add_metric(name="QuipAPIHTTPErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIHTTPErrors", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError(f"HTTP {response.status_code}: {response.text}")
                 
                 # Successful response
@@ -235,8 +256,8 @@ class QuipClient(QuipClientInterface):
                 })
                 
                 # Record successful API call metrics
-                metrics.add_metric(name="QuipAPIRequests", unit=MetricUnit.Count, value=1)
-                metrics.add_metric(name="QuipAPILatency", unit=MetricUnit.Seconds, value=total_duration)
+                _add_metric(name="QuipAPIRequests", unit=MetricUnit.Count, value=1)
+                _add_metric(name="QuipAPILatency", unit=MetricUnit.Seconds, value=total_duration)
                 
                 # Parse JSON response
                 try:
@@ -248,7 +269,7 @@ class QuipClient(QuipClientInterface):
                         "error": str(e),
                         "response_text": response.text[:500]
                     })
-                    metrics.add_metric(name="QuipAPIJSONErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIJSONErrors", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError(f"Invalid JSON response: {e}")
                     
             except requests.exceptions.Timeout:
@@ -262,7 +283,7 @@ class QuipClient(QuipClientInterface):
                         "retry_delay_seconds": delay,
                         "attempt_duration_seconds": round(attempt_duration, 3)
                     })
-                    metrics.add_metric(name="QuipAPITimeouts", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPITimeouts", unit=MetricUnit.Count, value=1)
                     time.sleep(delay)
                     continue
                 else:
@@ -272,7 +293,7 @@ class QuipClient(QuipClientInterface):
                         "max_retries": max_retries,
                         "total_duration_seconds": round(time.time() - request_start_time, 3)
                     })
-                    metrics.add_metric(name="QuipAPITimeoutFailures", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPITimeoutFailures", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError("Request timeout after all retries")
                     
             except requests.exceptions.ConnectionError:
@@ -286,7 +307,7 @@ class QuipClient(QuipClientInterface):
                         "retry_delay_seconds": delay,
                         "attempt_duration_seconds": round(attempt_duration, 3)
                     })
-                    metrics.add_metric(name="QuipAPIConnectionErrors", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIConnectionErrors", unit=MetricUnit.Count, value=1)
                     time.sleep(delay)
                     continue
                 else:
@@ -296,7 +317,7 @@ class QuipClient(QuipClientInterface):
                         "max_retries": max_retries,
                         "total_duration_seconds": round(time.time() - request_start_time, 3)
                     })
-                    metrics.add_metric(name="QuipAPIConnectionFailures", unit=MetricUnit.Count, value=1)
+                    _add_metric(name="QuipAPIConnectionFailures", unit=MetricUnit.Count, value=1)
                     raise QuipAPIError("Connection error after all retries")
                     
             except requests.exceptions.RequestException as e:
@@ -307,7 +328,7 @@ class QuipClient(QuipClientInterface):
                     "error_message": str(e),
                     "attempt_duration_seconds": round(time.time() - attempt_start_time, 3)
                 })
-                metrics.add_metric(name="QuipAPIRequestErrors", unit=MetricUnit.Count, value=1)
+                _add_metric(name="QuipAPIRequestErrors", unit=MetricUnit.Count, value=1)
                 raise QuipAPIError(f"Request failed: {e}")
         
         logger.error("Maximum retries exceeded for Quip API request", extra={
@@ -316,7 +337,7 @@ class QuipClient(QuipClientInterface):
             "max_retries": max_retries,
             "total_duration_seconds": round(time.time() - request_start_time, 3)
         })
-        metrics.add_metric(name="QuipAPIMaxRetriesExceeded", unit=MetricUnit.Count, value=1)
+        _add_metric(name="QuipAPIMaxRetriesExceeded", unit=MetricUnit.Count, value=1)
         raise QuipAPIError("Maximum retries exceeded")
     
     def get_folder_contents(self, folder_id: str) -> Dict:
@@ -362,38 +383,59 @@ class QuipClient(QuipClientInterface):
         
         # Quip API supports up to 100 thread IDs per request
         batch_size = 100
+        batches = [thread_ids[i:i + batch_size] for i in range(0, len(thread_ids), batch_size)]
         all_metadata = {}
         
-        for i in range(0, len(thread_ids), batch_size):
-            batch = thread_ids[i:i + batch_size]
-            
-            params = {
-                'ids': ','.join(batch)
-            }
-            
-            endpoint = "/2/threads/"
-            response = self._make_request("GET", endpoint, params=params)
-            
-            # Log sample response for debugging
-            if response and isinstance(response, dict):
-                sample_key = next(iter(response.keys())) if response else None
-                if sample_key:
-                    sample_thread = response[sample_key]
-                    logger.debug(f"Sample thread metadata: {sample_thread}", extra={
-                        "correlation_id": self.correlation_id,
-                        "sample_thread_id": sample_key,
-                        "metadata_keys": list(sample_thread.keys()) if isinstance(sample_thread, dict) else "not_dict"
-                    })
-            
-            # Merge batch results
-            if isinstance(response, dict):
-                all_metadata.update(response)
-            
-            logger.debug(f"Retrieved metadata for batch of {len(batch)} threads")
+        # Batches are independent, so fetch them concurrently and merge as they complete
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+            futures = [executor.submit(self._get_threads_batch, batch) for batch in batches]
+            try:
+                for future in as_completed(futures):
+                    all_metadata.update(future.result())
+            except Exception:
+                # Fail fast like the sequential loop did rather than waiting on queued batches
+                for pending in futures:
+                    pending.cancel()
+                raise
         
         logger.info(f"Retrieved metadata for {len(all_metadata)} threads total")
         return all_metadata
     
+    def _get_threads_batch(self, batch: List[str]) -> Dict:
+        """
+        Get thread metadata for a single batch of thread IDs
+        
+        Args:
+            batch: Up to 100 thread IDs
+            
+        Returns:
+            dict: Thread metadata for each thread ID in the batch
+            
+        Raises:
+            QuipAPIError: If API request fails
+        """
+        params = {
+            'ids': ','.join(batch)
+        }
+        
+        endpoint = "/2/threads/"
+        response = self._make_request("GET", endpoint, params=params)
+        
+        # Log sample response for debugging
+        if response and isinstance(response, dict):
+            sample_key = next(iter(response.keys())) if response else None
+            if sample_key:
+                sample_thread = response[sample_key]
+                logger.debug(f"Sample thread metadata: {sample_thread}", extra={
+                    "correlation_id": self.correlation_id,
+                    "sample_thread_id": sample_key,
+                    "metadata_keys": list(sample_thread.keys()) if isinstance(sample_thread, dict) else "not_dict"
+                })
+        
+        logger.debug(f"Retrieved metadata for batch of {len(batch)} threads")
+        
+        return response if isinstance(response, dict) else {}
+    
     def get_thread_html(self, thread_id: str) -> str:
         """
         Get thread HTML using Get a Thread API
@@ -436,89 +478,103 @@ class QuipClient(QuipClientInterface):
         
         discovered_threads = {}
         visited_folders: Set[str] = set()
-        folders_to_process = list(folder_ids)
+        frontier = list(folder_ids)
         
-        while folders_to_process:
-            folder_id = folders_to_process.pop(0)
-            
-            # Skip if already processed
-            if folder_id in visited_folders:
-                continue
-                
-            visited_folders.add(folder_id)
-            
-            try:
-                folder_contents = self.get_folder_contents(folder_id)
-                children = folder_contents.get('children', [])
-                
-                logger.debug(f"Folder {folder_id} contains {len(children)} children")
-                
-                # Log a sample of the raw response structure for debugging
-                if children and len(children) > 0:
-                    sample_child = children[0]
-                    logger.debug(f"Sample child structure: {sample_child}")
-                
-                valid_children = 0
-                for child in children:
-                    # Skip null/empty children
-                    if not child or not isinstance(child, dict):
+        # Walk the tree one level at a time, fetching every folder in a level concurrently.
+        # Only the API calls run on worker threads (sharing the session, with metric writes
+        # serialized by _add_metric); results are processed here so visited_folders and
+        # discovered_threads need no locking.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while frontier:
+                futures = {}
+                for folder_id in frontier:
+                    # Skip if already processed
+                    if folder_id in visited_folders:
                         continue
                     
-                    # Handle different API response formats
-                    # The API returns either:
-                    # 1. Full objects with id, type, title, etc. (for folders)
-                    # 2. Simple objects with just thread_id (for threads)
-                    
-                    child_id = child.get('folder_id') or child.get('id') or child.get('thread_id')
-                    if 'folder_id' in child.keys():
-                        child_type = 'FOLDER'
-                    else:
-                        child_type = child.get('type')
-                    child_title = child.get('title', 'No Title')
+                    visited_folders.add(folder_id)
+                    futures[executor.submit(self.get_folder_contents, folder_id)] = folder_id
+                
+                next_frontier = []
+                for future in as_completed(futures):
+                    folder_id = futures[future]
                     
-                    # Skip children with missing essential fields
-                    if not child_id:
-                        logger.debug(f"Skipping child with missing id/thread_id: {child}")
+                    try:
+                        folder_contents = future.result()
+                        children = folder_contents.get('children', [])
+                        
+                        logger.debug(f"Folder {folder_id} contains {len(children)} children")
+                        
+                        # Log a sample of the raw response structure for debugging
+                        if children and len(children) > 0:
+                            sample_child = children[0]
+                            logger.debug(f"Sample child structure: {sample_child}")
+                        
+                        valid_children = 0
+                        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                        for child in children:
+                            # Skip null/empty children
+                            if not child or not isinstance(child, dict):
+                                continue
+                            
+                            # Handle different API response formats
+                            # The API returns either:
+                            # 1. Full objects with id, type, title, etc. (for folders)
+                            # 2. Simple objects with just thread_id (for threads)
+                            
+                            thread_id = child.get('thread_id')
+                            if 'folder_id' in child:
+                                child_id = child['folder_id'] or child.get('id') or thread_id
+                                child_type = 'FOLDER'
+                            else:
+                                child_id = child.get('id') or thread_id
+                                child_type = child.get('type')
+                            
+                            # Skip children with missing essential fields
+                            if not child_id:
+                                if debug_enabled:
+                                    logger.debug(f"Skipping child with missing id/thread_id: {child}")
+                                continue
+                            
+                            valid_children += 1
+                            child_title = child.get('title', 'No Title')
+                            
+                            # If we have a thread_id but no type, assume it's a thread/document
+                            if thread_id and not child_type:
+                                child_type = 'THREAD'  # Default to thread type for thread_id entries
+                            
+                            if debug_enabled:
+                                logger.debug(f"Processing child: id={child_id}, type={child_type}, title={child_title}")
+                            
+                            if child_type == 'FOLDER':
+                                # Add subfolder to processing queue
+                                if child_id not in visited_folders:
+                                    next_frontier.append(child_id)
+                            
+                            elif thread_id or child_type in _THREAD_TYPES:
+                                # Store thread metadata from folder listing
+                                # Accept items with thread_id even if type is missing
+                                discovered_threads[child_id] = {
+                                    'id': child_id,
+                                    'title': child_title,
+                                    'type': child_type or 'THREAD',
+                                    'updated_usec': child.get('updated_usec', 0),
+                                    'author_id': child.get('author_id', ''),
+                                    'link': child.get('link', ''),
+                                    'parent_folder_id': folder_id
+                                }
+                            
+                            elif debug_enabled:
+                                logger.debug(f"Skipping child with unknown type: {child_type} (id={child_id}, title={child_title})")
+                        
+                        logger.debug(f"Folder {folder_id}: processed {valid_children} valid children out of {len(children)} total")
+                        
+                    except QuipAPIError as e:
+                        logger.error(f"Failed to process folder {folder_id}: {e}")
+                        # Continue with other folders rather than failing completely
                         continue
-                    
-                    valid_children += 1
-                    
-                    # If we have a thread_id but no type, assume it's a thread/document
-                    if child.get('thread_id') and not child_type:
-                        child_type = 'THREAD'  # Default to thread type for thread_id entries
-                        logger.debug(f"Processing thread: id={child_id}, type={child_type} (inferred)")
-                    else:
-                        logger.debug(f"Processing child: id={child_id}, type={child_type}, title={child_title}")
-                    
-                    if child_type == 'FOLDER':
-                        # Add subfolder to processing queue
-                        if child_id not in visited_folders:
-                            folders_to_process.append(child_id)
-                            logger.debug(f"Added subfolder {child_id} to discovery queue")
-                    
-                    elif child_type in ['DOCUMENT', 'SPREADSHEET', 'THREAD'] or child.get('thread_id'):
-                        # Store thread metadata from folder listing
-                        # Accept items with thread_id even if type is missing
-                        discovered_threads[child_id] = {
-                            'id': child_id,
-                            'title': child_title,
-                            'type': child_type or 'THREAD',
-                            'updated_usec': child.get('updated_usec', 0),
-                            'author_id': child.get('author_id', ''),
-                            'link': child.get('link', ''),
-                            'parent_folder_id': folder_id
-                        }
-                        logger.debug(f"Discovered {child_type or 'THREAD'} thread: {child_id} - {child_title}")
-                    
-                    else:
-                        logger.debug(f"Skipping child with unknown type: {child_type} (id={child_id}, title={child_title})")
-                
-                logger.debug(f"Folder {folder_id}: processed {valid_children} valid children out of {len(children)} total")
                 
-            except QuipAPIError as e:
-                logger.error(f"Failed to process folder {folder_id}: {e}")
-                # Continue with other folders rather than failing completely
-                continue
+                frontier = next_frontier
         
         logger.info(f"Discovery complete: found {len(discovered_threads)} threads in {len(visited_folders)} folders")
         
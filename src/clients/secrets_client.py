@@ -5,17 +5,22 @@ AWS Secrets Manager client interface
 import json
 import logging
 import os
-from typing import Tuple, List
+import urllib.request
+from typing import Any, Dict, Tuple, List, Optional
+from urllib.parse import urlencode
 from abc import ABC, abstractmethod
 
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError, BotoCoreError
 
-from exceptions import SecretsManagerError
+from exceptions import SecretsManagerError, ConfigurationError
 
 
 logger = logging.getLogger(__name__)
 
+# Value the stack writes to the folder IDs parameter until deploy.py stores the real IDs
+FOLDER_IDS_PLACEHOLDER = "-"
+
 
 class SecretsClientInterface(ABC):
     """
@@ -41,17 +46,21 @@ class SecretsClient(SecretsClientInterface):
     AWS Secrets Manager client implementation
     """
     
-    def __init__(self, secret_name: str, region_name: str = 'us-east-1'):
+    def __init__(self, secret_name: str, region_name: str = 'us-east-1', parameter_name: Optional[str] = None):
         """
         Initialize Secrets Manager client
         
         Args:
             secret_name: Name of the secret containing Quip credentials
             region_name: AWS region name
+            parameter_name: Name of the SSM parameter holding folder IDs; when not set,
+                folder IDs are read from the secret
         """
         self.secret_name = secret_name
         self.region_name = region_name
+        self.parameter_name = parameter_name
         self._client = None
+        self._ssm_client = None
     
     @property
     def client(self):
@@ -67,6 +76,20 @@ class SecretsClient(SecretsClientInterface):
                 raise SecretsManagerError(f"Failed to initialize Secrets Manager client: {str(e)}") from e
         return self._client
     
+    @property
+    def ssm_client(self):
+        """Lazy initialization of boto3 SSM client"""
+        if self._ssm_client is None:
+            try:
+                self._ssm_client = boto3.client('ssm', region_name=self.region_name)
+            except NoCredentialsError as e:
+                logger.error("AWS credentials not found")
+                raise SecretsManagerError("AWS credentials not configured") from e
+            except Exception as e:
+                logger.error("Failed to initialize SSM client")
+                raise SecretsManagerError(f"Failed to initialize SSM client: {str(e)}") from e
+        return self._ssm_client
+    
     def get_quip_credentials(self) -> Tuple[str, List[str]]:
         """
         Retrieve Quip access token and folder IDs from Secrets Manager or environment variables
@@ -80,6 +103,7 @@ class SecretsClient(SecretsClientInterface):
         
         Raises:
             SecretsManagerError: If credentials cannot be retrieved
+            ConfigurationError: If the folder IDs parameter still holds the deploy-time placeholder
         """
         # Check for local development environment variables first
         env_token = os.environ.get('QUIP_ACCESS_TOKEN')
@@ -98,8 +122,7 @@ class SecretsClient(SecretsClientInterface):
         try:
             logger.info(f"Retrieving secret: {self.secret_name}")
             
-            response = self.client.get_secret_value(SecretId=self.secret_name)
-            secret_string = response.get('SecretString')
+            secret_string = self._get_secret_string()
             
             if not secret_string:
                 raise SecretsManagerError("Secret value is empty")
@@ -117,9 +140,20 @@ class SecretsClient(SecretsClientInterface):
                 raise SecretsManagerError("Missing 'quip_access_token' in secret")
             
             # Extract and parse folder IDs
-            folder_ids_str = secret_data.get('folder_ids')
-            if not folder_ids_str:
-                raise SecretsManagerError("Missing 'folder_ids' in secret")
+            if self.parameter_name:
+                logger.info(f"Retrieving parameter: {self.parameter_name}")
+                folder_ids_str = self._get_parameter_value()
+                if not folder_ids_str:
+                    raise SecretsManagerError(f"Parameter '{self.parameter_name}' is empty")
+                if folder_ids_str.strip() == FOLDER_IDS_PLACEHOLDER:
+                    raise ConfigurationError(
+                        f"Parameter '{self.parameter_name}' has no folder IDs configured; "
+                        "run deploy.py or set it to a comma-separated list of Quip folder IDs"
+                    )
+            else:
+                folder_ids_str = secret_data.get('folder_ids')
+                if not folder_ids_str:
+                    raise SecretsManagerError("Missing 'folder_ids' in secret")
             
             # Convert comma-separated folder IDs to list
             folder_ids = self._parse_folder_ids(folder_ids_str)
@@ -131,7 +165,10 @@ class SecretsClient(SecretsClientInterface):
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
             
-            if error_code == 'ResourceNotFoundException':
+            if error_code == 'ParameterNotFound':
+                logger.error(f"Parameter not found: {self.parameter_name}")
+                raise SecretsManagerError(f"Parameter '{self.parameter_name}' not found") from e
+            elif error_code == 'ResourceNotFoundException':
                 logger.error(f"Secret not found: {self.secret_name}")
                 raise SecretsManagerError(f"Secret '{self.secret_name}' not found") from e
             elif error_code == 'InvalidRequestException':
@@ -156,13 +193,68 @@ class SecretsClient(SecretsClientInterface):
         except BotoCoreError as e:
             logger.error(f"Boto3 core error: {str(e)}")
             raise SecretsManagerError(f"AWS SDK error: {str(e)}") from e
-        except SecretsManagerError:
+        except (SecretsManagerError, ConfigurationError):
             # Re-raise our custom exceptions
             raise
         except Exception as e:
             logger.error(f"Unexpected error retrieving secret: {str(e)}")
             raise SecretsManagerError(f"Unexpected error: {str(e)}") from e
     
+    def _get_secret_string(self) -> Optional[str]:
+        """
+        Fetch the raw secret string, preferring the Parameters and Secrets Lambda Extension
+        
+        Returns:
+            The secret string, or None if the secret has no string value
+        """
+        response = self._fetch_from_extension('/secretsmanager/get', {'secretId': self.secret_name})
+        if response is None:
+            response = self.client.get_secret_value(SecretId=self.secret_name)
+        return response.get('SecretString')
+    
+    def _get_parameter_value(self) -> Optional[str]:
+        """
+        Fetch the folder IDs parameter value, preferring the Parameters and Secrets Lambda Extension
+        
+        Returns:
+            The parameter value
+        """
+        response = self._fetch_from_extension('/systemsmanager/parameters/get', {'name': self.parameter_name})
+        if response is None:
+            response = self.ssm_client.get_parameter(Name=self.parameter_name)
+        return response['Parameter']['Value']
+    
+    def _fetch_from_extension(self, path: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        """
+        Fetch a value from the Parameters and Secrets Lambda Extension's localhost cache
+        
+        The extension returns the same JSON body as the matching AWS API call, so callers
+        can read the result exactly as they would the boto3 response.
+        
+        Args:
+            path: Extension endpoint path, e.g. '/secretsmanager/get'
+            params: Query string parameters for the endpoint
+            
+        Returns:
+            The decoded response, or None if the extension is not configured or the request
+            failed, in which case the caller should fall back to the AWS API
+        """
+        extension_port = os.environ.get('PARAMETERS_SECRETS_EXTENSION_HTTP_PORT')
+        session_token = os.environ.get('AWS_SESSION_TOKEN')
+        if not (extension_port and session_token):
+            return None
+        
+        request = urllib.request.Request(
+            f"http://localhost:{extension_port}{path}?{urlencode(params)}",
+            headers={'X-Aws-Parameters-Secrets-Token': session_token}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=2) as response:
+                return json.loads(response.read())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Secrets extension unavailable for {path}, falling back to the AWS API: {str(e)}")
+            return None
+    
     def _parse_folder_ids(self, folder_ids_str: str) -> List[str]:
         """
         Parse comma-separated folder IDs into a list
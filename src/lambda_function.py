@@ -28,7 +28,47 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+# Client wrappers are created during init so that, with SnapStart, they are captured in the
+# snapshot instead of being rebuilt on every invocation. Only the S3 client builds its boto3
+# client here; SecretsClient reads through the Parameters and Secrets Lambda Extension and
+# only builds its Secrets Manager and SSM fallback clients on first use. The Quip client is
+# still built per invocation because it needs the access token, which must not be baked
+# into a snapshot.
+BUCKET_NAME = os.environ.get('S3_BUCKET_NAME')
+SECRET_NAME = os.environ.get('SECRET_NAME')
+REGION_NAME = os.environ.get('AWS_REGION', 'us-east-1')
 
+_secrets_client = SecretsClient(
+    secret_name=SECRET_NAME,
+    region_name=REGION_NAME,
+    parameter_name=os.environ.get('FOLDER_IDS_PARAMETER_NAME')
+) if SECRET_NAME else None
+_s3_client = S3Client(bucket_name=BUCKET_NAME, region_name=REGION_NAME) if BUCKET_NAME else None
+
+
+def _get_max_workers() -> int:
+    """
+    Read the maximum number of concurrent Quip API requests from QUIP_MAX_WORKERS
+    
+    Returns:
+        int: The configured worker count, or 8 when the variable is not set
+        
+    Raises:
+        ConfigurationError: If the value is not a positive integer
+    """
+    value = os.environ.get('QUIP_MAX_WORKERS', '').strip()
+    if not value:
+        return 8
+    try:
+        max_workers = int(value)
+    except ValueError:
+        max_workers = 0
+    if max_workers < 1:
+        raise ConfigurationError(f"QUIP_MAX_WORKERS must be a positive integer, got '{value}'")
+    return max_workers
+
+
+@metrics.log_metrics
 def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, Any]:
     """
     Main Lambda handler for Quip-S3 synchronization
@@ -59,14 +99,15 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
     
     try:
         # Validate required environment variables
-        bucket_name = os.environ.get('S3_BUCKET_NAME')
-        secret_name = os.environ.get('SECRET_NAME')
-        region_name = os.environ.get('AWS_REGION', 'us-east-1')
+        bucket_name = BUCKET_NAME
+        secret_name = SECRET_NAME
+        region_name = REGION_NAME
         
         if not bucket_name:
             raise ConfigurationError("S3_BUCKET_NAME environment variable is required")
         if not secret_name:
             raise ConfigurationError("SECRET_NAME environment variable is required")
+        max_workers = _get_max_workers()
         
         logger.info("Environment configuration validated", extra={
             "correlation_id": correlation_id,
@@ -78,8 +119,9 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
         # Initialize AWS clients with correlation ID
         logger.info("Initializing AWS clients", extra={"correlation_id": correlation_id})
         
-        secrets_client = SecretsClient(secret_name=secret_name, region_name=region_name)
-        s3_client = S3Client(bucket_name=bucket_name, region_name=region_name, correlation_id=correlation_id)
+        secrets_client = _secrets_client
+        s3_client = _s3_client
+        s3_client.correlation_id = correlation_id
         
         # Retrieve Quip credentials and configuration
         logger.info("Retrieving Quip credentials from Secrets Manager", extra={
@@ -94,7 +136,11 @@ def lambda_handler(event: Dict[str, Any], context: LambdaContext) -> Dict[str, A
         })
         
         # Initialize Quip client and sync engine with correlation ID
-        quip_client = QuipClient(access_token=access_token, correlation_id=correlation_id)
+        quip_client = QuipClient(
+            access_token=access_token,
+            correlation_id=correlation_id,
+            max_workers=max_workers
+        )
         sync_engine = SyncEngine(quip_client=quip_client, s3_client=s3_client, correlation_id=correlation_id)
         
         # Execute synchronization workflow